@@ -0,0 +1,84 @@
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+
+POOL_MAXSIZE = 100  # keep-alive connections per host, >= the largest scanner concurrency
+HTTP_WORKERS = int(os.getenv("HTTP_WORKERS", 64))
+
+_session = None
+_executor = None
+_lock = threading.Lock()
+
+
+def get_session():
+    """Process-wide keep-alive session shared by the scanner blueprints."""
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=50, pool_maxsize=POOL_MAXSIZE)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                # Shared across scans and targets, so never let one scan's cookies leak into another
+                session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+                _session = session
+    return _session
+
+
+def get_executor():
+    """Process-wide worker pool for outbound scanner requests."""
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=HTTP_WORKERS, thread_name_prefix="http-worker")
+    return _executor
+
+
+class ResponseCache:
+    """Per-scan GET cache for URLs that more than one check reads.
+
+    Callers pass how many reads a URL will get in total. Concurrent callers for
+    the same URL share a single request, errors included, and the entry is
+    dropped after its last read so a long scan only holds what is still wanted.
+    A URL read once is fetched directly and never stored.
+    """
+
+    def __init__(self, session, limiter=None):
+        self.session = session
+        self.limiter = limiter
+        self._entries = {}  # url -> [future, reads left]
+        self._lock = threading.Lock()
+
+    def _fetch(self, url, timeout):
+        if self.limiter:
+            self.limiter.acquire(urlsplit(url).hostname)
+        start = time.time()
+        response = self.session.get(url, timeout=timeout)
+        return response, time.time() - start
+
+    def get(self, url, timeout, reads=1):
+        """Return (response, elapsed_seconds) for url, fetching it at most once for all reads."""
+        if reads <= 1:
+            return self._fetch(url, timeout)
+        with self._lock:
+            entry = self._entries.get(url)
+            owner = entry is None
+            if owner:
+                entry = self._entries[url] = [Future(), reads]
+            entry[1] -= 1
+            if entry[1] <= 0:
+                del self._entries[url]
+        future = entry[0]
+        if owner:
+            try:
+                future.set_result(self._fetch(url, timeout))
+            except Exception as e:
+                future.set_exception(e)
+        return future.result()
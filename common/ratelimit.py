@@ -0,0 +1,28 @@
+import threading
+import time
+
+
+class HostRateLimiter:
+    """Thread-safe token bucket per host, shared by concurrent scan workers."""
+
+    def __init__(self, rate, burst=None):
+        # rate <= 0 disables limiting
+        self.rate = float(rate or 0)
+        self.burst = float(burst or max(self.rate, 1))
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, host):
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                tokens, last = self._buckets.get(host, (self.burst, now))
+                tokens = min(self.burst, tokens + (now - last) * self.rate)
+                if tokens >= 1:
+                    self._buckets[host] = (tokens - 1, now)
+                    return
+                self._buckets[host] = (tokens, now)
+                wait = (1 - tokens) / self.rate
+            time.sleep(wait)
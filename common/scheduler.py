@@ -0,0 +1,27 @@
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+def iter_completed(fn, items, concurrency, executor=None):
+    """Run fn over items on a bounded pool, yielding results as they complete.
+
+    At most `concurrency` items are in flight, so large or lazy item streams are
+    never queued up front. Closing the generator stops new submissions. Pass a
+    long-lived executor to share its threads; otherwise a private pool is used.
+    """
+    if executor is None:
+        with ThreadPoolExecutor(max_workers=concurrency) as own:
+            yield from _window(fn, items, concurrency, own)
+    else:
+        yield from _window(fn, items, concurrency, executor)
+
+
+def _window(fn, items, concurrency, executor):
+    item_iter = iter(items)
+    pending = {executor.submit(fn, item) for _, item in zip(range(concurrency), item_iter)}
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield future.result()
+            for item in item_iter:
+                pending.add(executor.submit(fn, item))
+                break
@@ -0,0 +1,47 @@
+from urllib.parse import urlsplit
+
+# Path extension -> category; covers everything the JS Finder and File Fetcher matched on
+CATEGORY_EXTENSIONS = {
+    "js": ["js"],
+    "config": ["json", "xml", "yml", "yaml", "ini", "config"],
+    "backup": ["bak", "backup", "tmp", "cache"],
+    "archive": ["zip", "tar.gz", "tgz", "gz", "tar", "7z", "rar"],
+    "keys": ["crt", "pem", "key", "pub", "asc", "secret"],
+    "docs": ["pdf", "doc", "docx", "xls", "xlsx", "pptx", "txt", "md", "csv"],
+    "data": ["sql", "db", "log", "md5"],
+    "binaries": ["exe", "dll", "bin", "bat", "sh", "deb", "rpm", "iso", "img", "apk", "msi", "dmg"],
+}
+FILE_CATEGORIES = [c for c in CATEGORY_EXTENSIONS if c != "js"]
+EXTENSION_CATEGORY = {ext: cat for cat, exts in CATEGORY_EXTENSIONS.items() for ext in exts}
+
+
+def path_extension(url):
+    """Lower-cased extension of the URL's last path segment, or None."""
+    try:
+        path = urlsplit(url).path
+    except ValueError:
+        return None
+    name = path.rsplit("/", 1)[-1].lower()
+    if name.endswith(".tar.gz"):
+        return "tar.gz"
+    if "." not in name:
+        return None
+    return name.rsplit(".", 1)[1]
+
+
+def classify_url(url):
+    return EXTENSION_CATEGORY.get(path_extension(url))
+
+
+def classify_urls(urls):
+    """Bucket URLs by category in a single pass, keeping input order within each bucket."""
+    facets = {cat: [] for cat in CATEGORY_EXTENSIONS}
+    for url in urls:
+        cat = classify_url(url)
+        if cat:
+            facets[cat].append(url)
+    return facets
+
+
+def facet_counts(facets):
+    return {cat: len(urls) for cat, urls in facets.items()}
@@ -0,0 +1,35 @@
+from urllib.parse import urlsplit, urlunsplit, unquote_plus
+
+
+def query_params(url):
+    """Names of the query parameters in url, in order, without duplicates."""
+    names = []
+    for pair in urlsplit(url).query.split("&"):
+        name = unquote_plus(pair.split("=", 1)[0])
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def inject_param(url, param, payload):
+    """Append an already-encoded payload to the first value of param, keeping the rest of the URL as-is."""
+    parts = urlsplit(url)
+    pairs = parts.query.split("&")
+    for i, pair in enumerate(pairs):
+        name, sep, value = pair.partition("=")
+        if unquote_plus(name) == param:
+            pairs[i] = f"{name}={value}{payload}"
+            break
+    return urlunsplit(parts._replace(query="&".join(pairs)))
+
+
+def replace_param(url, param, value):
+    """Set the first value of param to an already-encoded value, keeping the rest of the URL as-is."""
+    parts = urlsplit(url)
+    pairs = parts.query.split("&")
+    for i, pair in enumerate(pairs):
+        name = pair.partition("=")[0]
+        if unquote_plus(name) == param:
+            pairs[i] = f"{name}={value}"
+            break
+    return urlunsplit(parts._replace(query="&".join(pairs)))
@@ -0,0 +1,207 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+import requests
+from common.urlclassify import classify_url
+
+WAYBACK_URL = "https://web.archive.org/cdx/search/cdx"
+REQUEST_HEADERS = {'User-Agent': 'PassiveLinkFinder/1.0'}
+DEFAULT_LIMIT = 10000
+PAGE_SIZE = 5000  # rows per CDX page when streaming with resume keys
+MAX_RETRIES = 5
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache", "wayback")
+CACHE_TTL = int(os.getenv("WAYBACK_CACHE_TTL", 24 * 3600))
+CACHE_MAX_BYTES = int(os.getenv("WAYBACK_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+
+_key_locks = {}
+_key_locks_guard = threading.Lock()
+
+
+def cdx_params(domain, limit=DEFAULT_LIMIT):
+    params = {
+        "url": f"*.{domain}/*",
+        "collapse": "urlkey",
+        "output": "text",
+        "fl": "original",
+    }
+    if limit is not None:
+        params["limit"] = str(limit)
+    return params
+
+
+def cache_path(params):
+    key = hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()
+    return os.path.join(CACHE_DIR, f"{key}.txt.gz")
+
+
+def _key_lock(path):
+    with _key_locks_guard:
+        return _key_locks.setdefault(path, threading.Lock())
+
+
+def _read_cache(path):
+    try:
+        if time.time() - os.path.getmtime(path) > CACHE_TTL:
+            os.remove(path)
+            return None
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return f.read().splitlines()
+    except OSError:
+        return None
+
+
+def _write_cache(path, lines):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    with gzip.open(tmp, "wt", encoding="utf-8") as f:
+        f.write("\n".join(lines))
+    os.replace(tmp, path)
+    evict_cache()
+
+
+def evict_cache(max_bytes=None):
+    """Drop expired entries, then the least recently written ones until under max_bytes."""
+    max_bytes = CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    try:
+        entries = [os.path.join(CACHE_DIR, name) for name in os.listdir(CACHE_DIR) if name.endswith(".gz")]
+    except OSError:
+        return
+    now = time.time()
+    stats = []
+    for path in entries:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        if now - st.st_mtime > CACHE_TTL:
+            os.remove(path)
+        else:
+            stats.append((st.st_mtime, st.st_size, path))
+    total = sum(size for _, size, _ in stats)
+    for _, size, path in sorted(stats):
+        if total <= max_bytes:
+            break
+        os.remove(path)
+        total -= size
+
+
+def _download(params):
+    for attempt in range(MAX_RETRIES):
+        try:
+            res = requests.get(WAYBACK_URL, params=params, headers=REQUEST_HEADERS, timeout=(10, 120))
+            res.raise_for_status()
+            return [line.strip() for line in res.text.splitlines() if line.strip()]
+        except requests.RequestException:
+            if attempt == MAX_RETRIES - 1:
+                raise
+            time.sleep(2 ** attempt)
+    return []
+
+
+def fetch_wayback_urls(domain, limit=DEFAULT_LIMIT):
+    """Archived URLs for *.domain, served from the on-disk cache when fresh.
+
+    The cache is keyed by the full CDX query, so every blueprint asking for the
+    same domain shares one archive download.
+    """
+    params = cdx_params(domain, limit)
+    path = cache_path(params)
+    with _key_lock(path):
+        lines = _read_cache(path)
+        if lines is None:
+            lines = _download(params)
+            _write_cache(path, lines)
+    return lines
+
+
+def _open_page(params):
+    for attempt in range(MAX_RETRIES):
+        try:
+            res = requests.get(WAYBACK_URL, params=params, headers=REQUEST_HEADERS, timeout=(10, 120), stream=True)
+            res.raise_for_status()
+            return res
+        except requests.RequestException:
+            if attempt == MAX_RETRIES - 1:
+                raise
+            time.sleep(2 ** attempt)
+
+
+def _iter_pages(params):
+    """Yield rows page by page, following CDX resume keys until the listing ends.
+
+    With showResumeKey the CDX server ends each page with a blank line followed
+    by the key to pass as resumeKey for the next page.
+    """
+    resume_key = None
+    while True:
+        page = dict(params, limit=str(PAGE_SIZE), showResumeKey="true")
+        if resume_key:
+            page["resumeKey"] = resume_key
+        resume_key = None
+        after_blank = False
+        with _open_page(page) as res:
+            res.encoding = res.encoding or "utf-8"
+            for raw in res.iter_lines(decode_unicode=True):
+                line = (raw or "").strip()
+                if not line:
+                    after_blank = True
+                elif after_blank:
+                    resume_key = line
+                else:
+                    yield line
+        if not resume_key:
+            return
+
+
+def iter_wayback_urls(domain):
+    """Stream every archived URL for *.domain at constant memory.
+
+    A fresh cached listing is replayed line by line from disk. Otherwise rows
+    are yielded as they arrive and written to a temporary cache file, which only
+    replaces the cache entry once the whole listing has been read.
+    """
+    path = cache_path(cdx_params(domain, limit=None))
+    try:
+        if time.time() - os.path.getmtime(path) <= CACHE_TTL:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    yield line.rstrip("\n")
+            return
+    except OSError:
+        pass
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            for line in _iter_pages(cdx_params(domain, limit=None)):
+                f.write(line + "\n")
+                yield line
+        os.replace(tmp, path)
+        evict_cache()
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def stream_urls(domain, categories=None):
+    """NDJSON stream of archived URLs for *.domain whose category is in categories (all if None).
+
+    Each match is a {"url", "category"} record; a failure part-way through is
+    reported as an error record, and a final done record always carries the count.
+    """
+    count = 0
+    try:
+        for url in iter_wayback_urls(domain):
+            category = classify_url(url)
+            if categories is None or category in categories:
+                count += 1
+                yield json.dumps({"url": url, "category": category}) + "\n"
+    except Exception as e:
+        yield json.dumps({"error": f"Failed to fetch from Wayback: {e}"}) + "\n"
+    yield json.dumps({"done": True, "domain": domain, "count": count}) + "\n"
@@ -1,5 +1,9 @@
-from flask import Blueprint, request, jsonify, send_from_directory
+from flask import Blueprint, request, jsonify, Response, send_from_directory
 import requests
+from common.http import get_session, get_executor
+from common.scheduler import iter_completed
+from common.urls import query_params, inject_param
+import json
 import random
 import string
 import urllib.parse
@@ -37,17 +41,72 @@ def build_payloads(tag):
         payloads.append(urllib.parse.quote(t.format(tag=tag), safe=''))
     return payloads
 
+DEFAULT_CONCURRENCY = 8
+MAX_CONCURRENCY = 50
+MAX_SWEEP_TARGETS = 500
+
 @crlf_bp.route("/", methods=["GET"])
 def serve_ui():
     folder_path = os.path.dirname(os.path.abspath(__file__))
     return send_from_directory(folder_path, "index.html")
 
+def fetch_baseline(session, target, timeout):
+    try:
+        rbase = session.get(target, timeout=timeout, verify=False)
+        return {
+            "status_code": rbase.status_code,
+            "headers": dict(rbase.headers),
+            "body_snippet": rbase.text[:800]
+        }
+    except Exception as e:
+        return {"error": f"Baseline fetch error: {str(e)}"}
+
+def check_payload(session, test_url, p, tag, timeout, compact=False):
+    """Send one payload and look for the tag in the response headers or body.
+
+    In compact mode the full headers and body snippet are only kept for positives.
+    """
+    attempt = {"payload": urllib.parse.unquote(p), "test_url": test_url, "time": datetime.utcnow().isoformat()}
+    try:
+        r = session.get(test_url, timeout=timeout, verify=False, allow_redirects=False)
+        headers = dict(r.headers)
+        body_snippet = r.text[:2000] if r.text else ""
+
+        lowered = {k.lower(): v for k, v in headers.items()}
+        found_headers = []
+        for hk, hv in lowered.items():
+            if tag in str(hv):
+                found_headers.append({"header": hk, "value": hv})
+        if "set-cookie" in lowered and tag in lowered["set-cookie"]:
+            found_headers.append({"header": "set-cookie", "value": lowered["set-cookie"]})
+
+        body_reflection = tag in body_snippet
+
+        vulnerable = bool(found_headers) or body_reflection
+
+        attempt.update({
+            "status_code": r.status_code,
+            "found_headers": found_headers,
+            "body_reflected": body_reflection,
+            "vulnerable": vulnerable
+        })
+        if vulnerable or not compact:
+            attempt.update({"headers": headers, "body_snippet": body_snippet})
+    except Exception as e:
+        attempt.update({
+            "error": str(e),
+            "vulnerable": False
+        })
+    return attempt
+
 @crlf_bp.route("/crlf-test", methods=["POST"])
 def crlf_test():
     data = request.get_json() or {}
     target = (data.get("url") or "").strip()
     confirm = data.get("confirm", False)
     timeout = float(data.get("timeout", 8))
+    compact = bool(data.get("compact", False))
+    concurrency = min(max(int(data.get("concurrency", DEFAULT_CONCURRENCY)), 1), MAX_CONCURRENCY)
 
     if not confirm:
         return jsonify({"error": "Explicit confirmation required. Set 'confirm': true to proceed."}), 400
@@ -59,53 +118,18 @@ def crlf_test():
     tag = f"crlf-{rand_tag(6)}"
     payloads = build_payloads(tag)
 
-    results = []
-    baseline = None
+    session = get_session()
+    executor = get_executor()
+    # The baseline is independent of the payloads, so fetch it alongside them
+    baseline_future = executor.submit(fetch_baseline, session, target, timeout)
 
-    try:
-        rbase = requests.get(target, timeout=timeout, verify=False)
-        baseline = {
-            "status_code": rbase.status_code,
-            "headers": dict(rbase.headers),
-            "body_snippet": rbase.text[:800]
-        }
-    except Exception as e:
-        baseline = {"error": f"Baseline fetch error: {str(e)}"}
-
-    for p in payloads:
-        test_url = target + p
-        attempt = {"payload": urllib.parse.unquote(p), "test_url": test_url, "time": datetime.utcnow().isoformat()}
-        try:
-            r = requests.get(test_url, timeout=timeout, verify=False, allow_redirects=False)
-            headers = dict(r.headers)
-            body_snippet = r.text[:2000] if r.text else ""
-
-            lowered = {k.lower(): v for k, v in headers.items()}
-            found_headers = []
-            for hk, hv in lowered.items():
-                if tag in str(hv):
-                    found_headers.append({"header": hk, "value": hv})
-            if "set-cookie" in lowered and tag in lowered["set-cookie"]:
-                found_headers.append({"header": "set-cookie", "value": lowered["set-cookie"]})
-
-            body_reflection = tag in body_snippet
-
-            vulnerable = bool(found_headers) or body_reflection
-
-            attempt.update({
-                "status_code": r.status_code,
-                "headers": headers,
-                "found_headers": found_headers,
-                "body_reflected": body_reflection,
-                "body_snippet": body_snippet,
-                "vulnerable": vulnerable
-            })
-        except Exception as e:
-            attempt.update({
-                "error": str(e),
-                "vulnerable": False
-            })
-        results.append(attempt)
+    def run(indexed):
+        i, p = indexed
+        return i, check_payload(session, target + p, p, tag, timeout, compact)
+
+    by_index = dict(iter_completed(run, enumerate(payloads), concurrency, executor=executor))
+    results = [by_index[i] for i in range(len(payloads))]
+    baseline = baseline_future.result()
 
     positives = [r for r in results if r.get("vulnerable")]
 
@@ -119,3 +143,72 @@ def crlf_test():
         "positives": positives,
         "all_results": results
     })
+
+def sweep_targets(data):
+    """Target URLs from 'urls', or from 'host' joined with each of 'paths'."""
+    urls = data.get("urls") or []
+    host = (data.get("host") or "").strip().rstrip("/")
+    if host:
+        if not host.startswith(("http://", "https://")):
+            host = "https://" + host
+        urls = urls + [host + "/" + str(p).lstrip("/") for p in data.get("paths") or [""]]
+    targets = []
+    for u in urls:
+        u = u.strip() if isinstance(u, str) else ""
+        if u.startswith(("http://", "https://")) and u not in targets:
+            targets.append(u)
+    return targets
+
+def injection_points(target, payloads):
+    """(param, test_url, payload) for each payload in every query parameter, or appended to the path."""
+    params = query_params(target)
+    if not params:
+        return [(None, target + p, p) for p in payloads]
+    return [(param, inject_param(target, param, p), p) for param in params for p in payloads]
+
+@crlf_bp.route("/crlf-sweep", methods=["POST"])
+def crlf_sweep():
+    """Run every payload variant against many targets, streaming NDJSON per target."""
+    data = request.get_json() or {}
+    if not data.get("confirm", False):
+        return jsonify({"error": "Explicit confirmation required. Set 'confirm': true to proceed."}), 400
+
+    targets = sweep_targets(data)
+    if not targets:
+        return jsonify({"error": "Provide 'urls', or a 'host' with 'paths'"}), 400
+    if len(targets) > MAX_SWEEP_TARGETS:
+        return jsonify({"error": f"At most {MAX_SWEEP_TARGETS} targets per sweep"}), 400
+
+    timeout = float(data.get("timeout", 8))
+    compact = bool(data.get("compact", True))
+    concurrency = min(max(int(data.get("concurrency", DEFAULT_CONCURRENCY)), 1), MAX_CONCURRENCY)
+
+    run_id = rand_tag(8)
+    tag = f"crlf-{rand_tag(6)}"
+    payloads = build_payloads(tag)
+    points = {t: injection_points(t, payloads) for t in targets}
+    jobs = [(t,) + point for t in targets for point in points[t]]
+    session = get_session()
+
+    def run(job):
+        target, param, test_url, p = job
+        attempt = check_payload(session, test_url, p, tag, timeout, compact)
+        attempt.update({"target": target, "param": param})
+        return attempt
+
+    def generate():
+        yield json.dumps({"run_id": run_id, "tag": tag, "targets": len(targets), "jobs": len(jobs)}) + "\n"
+        remaining = {t: len(points[t]) for t in targets}
+        positives = {t: 0 for t in targets}
+        for attempt in iter_completed(run, jobs, concurrency, executor=get_executor()):
+            target = attempt["target"]
+            positives[target] += attempt["vulnerable"]
+            if attempt["vulnerable"] or not compact:
+                yield json.dumps(attempt) + "\n"
+            remaining[target] -= 1
+            if not remaining[target]:
+                yield json.dumps({"target": target, "target_done": True, "results_count": len(points[target]),
+                                  "positives_count": positives[target]}) + "\n"
+        yield json.dumps({"done": True, "targets": len(targets), "positives_count": sum(positives.values())}) + "\n"
+
+    return Response(generate(), mimetype="text/plain")
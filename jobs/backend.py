@@ -0,0 +1,77 @@
+from flask import Blueprint, request, jsonify, Response, session, current_app
+import threading
+import json
+from jobs.manager import JobManager, TOOLS, FINISHED
+
+jobs_bp = Blueprint('jobs_bp', __name__)
+
+_manager_lock = threading.Lock()
+
+def get_manager():
+    app = current_app._get_current_object()
+    with _manager_lock:
+        if "jobs" not in app.extensions:
+            app.extensions["jobs"] = JobManager(app)
+    return app.extensions["jobs"]
+
+def current_user():
+    return session.get("username") or request.remote_addr or "anonymous"
+
+def get_user_job(job_id):
+    """The job, if it exists and belongs to the caller; other users' jobs look missing."""
+    job = get_manager().get(job_id)
+    return job if job and job.user == current_user() else None
+
+@jobs_bp.route("/submit", methods=["POST"])
+def submit_job():
+    data = request.get_json() or {}
+    tool = data.get("tool")
+    params = data.get("params") or {}
+    if tool not in TOOLS:
+        return jsonify({"error": f"Unknown tool. Choose one of: {', '.join(sorted(TOOLS))}"}), 400
+    if not isinstance(params, dict):
+        return jsonify({"error": "'params' must be an object"}), 400
+    if "concurrency" in params:
+        try:
+            int(params["concurrency"])
+        except (TypeError, ValueError):
+            return jsonify({"error": "'concurrency' must be an integer"}), 400
+
+    job = get_manager().submit(tool, params, current_user())
+    return jsonify(job.to_dict()), 202
+
+@jobs_bp.route("/", methods=["GET"])
+def list_jobs():
+    jobs = get_manager().list(current_user())
+    return jsonify({"jobs": [j.to_dict() for j in sorted(jobs, key=lambda j: j.created_at, reverse=True)]})
+
+@jobs_bp.route("/<job_id>", methods=["GET"])
+def job_status(job_id):
+    job = get_user_job(job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job.to_dict())
+
+@jobs_bp.route("/<job_id>/stream", methods=["GET"])
+def stream_job(job_id):
+    job = get_user_job(job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    start = request.args.get("from", 0, type=int)
+
+    def generate():
+        for event in job.iter_events(start):
+            yield json.dumps(event) + "\n"
+        yield json.dumps({"job_done": True, "status": job.status}) + "\n"
+
+    return Response(generate(), mimetype="text/plain")
+
+@jobs_bp.route("/<job_id>/cancel", methods=["POST"])
+def cancel_job(job_id):
+    job = get_user_job(job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    job = get_manager().cancel(job_id)
+    if not job.cancel_event.is_set() and job.status not in FINISHED:
+        return jsonify({"error": f"A running {job.tool} job cannot be interrupted", "job": job.to_dict()}), 409
+    return jsonify(job.to_dict())
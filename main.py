@@ -20,9 +20,11 @@ from ssl_scanner.backend import ssl_bp
 from ssti.backend import ssti_bp
 from subdomain_finder.app import subdomain_finder_bp
 from tech.backend import tech_bp
+from tech.engine import warm_up as warm_up_tech_engine
 from xss.backend import xss_bp
 from lina_chatbot.backend import lina_bp  # NEW: Import LINA chatbot
 from reports.backend import reports_bp
+from jobs.backend import jobs_bp
 
 # Flask will automatically use 'templates' folder by default
 app = Flask(__name__)
@@ -46,6 +48,10 @@ app.register_blueprint(tech_bp, url_prefix='/api/tech-detect')
 app.register_blueprint(xss_bp, url_prefix='/api/xss')
 app.register_blueprint(lina_bp, url_prefix='/api/ask-lina')  # NEW: Register LINA chatbot
 app.register_blueprint(reports_bp, url_prefix='/api/reports')
+app.register_blueprint(jobs_bp, url_prefix='/api/jobs')
+
+# Compile the Wappalyzer fingerprint database once, off the request path
+warm_up_tech_engine()
 
 
 @app.route('/')
@@ -1,8 +1,11 @@
-from flask import Blueprint, request, jsonify, send_from_directory
+from flask import Blueprint, request, jsonify, Response, send_from_directory
 import requests
 from requests.exceptions import RequestException
 from urllib.parse import urlparse, urljoin
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from common.http import get_session, get_executor
+from common.scheduler import iter_completed
+from common.urls import query_params, replace_param
+import json
 import os
 
 open_redirect_bp = Blueprint('open_redirect_bp', __name__)
@@ -27,6 +30,18 @@ DEFAULT_PAYLOADS = [
     "/redirect?url=//evil.com"
 ]
 
+# Parameter names that commonly carry a redirect target
+REDIRECT_PARAMS = {
+    "url", "uri", "u", "redirect", "redirect_uri", "redirect_url", "redirecturl", "redir",
+    "return", "returnto", "return_to", "returnurl", "return_url", "next", "next_url",
+    "dest", "destination", "continue", "goto", "target", "rurl", "out", "to", "link",
+    "forward", "callback", "callback_url", "checkout_url", "success_url", "view", "location",
+}
+
+DEFAULT_CONCURRENCY = 20
+MAX_CONCURRENCY = 50
+MAX_BATCH_URLS = 500
+
 REQUEST_HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
 }
@@ -44,8 +59,8 @@ def is_external_redirect(base_url: str, location_header: str) -> bool:
         return False
     return False
 
-def check_url(session: requests.Session, base_url: str, payload: str):
-    test_url = base_url + payload
+def check_url(session: requests.Session, base_url: str, payload: str, test_url: str = None):
+    test_url = test_url or base_url + payload
     result = {
         "payload": payload,
         "url": test_url,
@@ -96,25 +111,51 @@ def open_redirect_scanner():
     if '=' not in urlparse(base_url).query:
         return jsonify({"error": "URL must contain a parameter for testing (e.g., ?redirect=)"}), 400
 
+    session = get_session()
     results = []
-    with ThreadPoolExecutor(max_workers=20) as executor:
-        with requests.Session() as session:
-            future_to_payload = {
-                executor.submit(check_url, session, base_url, payload): payload
-                for payload in DEFAULT_PAYLOADS
-            }
-            for future in as_completed(future_to_payload):
-                try:
-                    res = future.result()
-                    results.append(res)
-                except Exception as e:
-                    payload = future_to_payload[future]
-                    results.append({
-                        "payload": payload,
-                        "url": base_url + payload,
-                        "status": "Error",
-                        "error": f"Task generation failed: {str(e)}"
-                    })
+    for res in iter_completed(lambda payload: check_url(session, base_url, payload), DEFAULT_PAYLOADS,
+                              DEFAULT_CONCURRENCY, executor=get_executor()):
+        results.append(res)
 
     sorted_results = sorted(results, key=lambda x: 'Vulnerability' not in x['status'])
     return jsonify({"results": sorted_results})
+
+def redirect_params(url, all_params=False):
+    params = query_params(url)
+    return params if all_params else [p for p in params if p.lower() in REDIRECT_PARAMS]
+
+@open_redirect_bp.route("/batch", methods=["POST"])
+def open_redirect_batch():
+    """Inject every payload into each redirect-like parameter of many URLs, streaming NDJSON."""
+    requests.packages.urllib3.disable_warnings(requests.packages.urllib3.exceptions.InsecureRequestWarning)
+    body = request.get_json() or {}
+    urls = body.get("urls") or []
+    if not isinstance(urls, list) or not urls:
+        return jsonify({"error": "Provide a non-empty 'urls' list"}), 400
+    if len(urls) > MAX_BATCH_URLS:
+        return jsonify({"error": f"At most {MAX_BATCH_URLS} URLs per batch"}), 400
+    all_params = bool(body.get("all_params", False))
+    concurrency = min(max(int(body.get("concurrency", DEFAULT_CONCURRENCY)), 1), MAX_CONCURRENCY)
+
+    urls = [u.strip() for u in urls if isinstance(u, str) and u.strip().startswith(('http://', 'https://'))]
+    targets = [(u, redirect_params(u, all_params)) for u in urls]
+    jobs = [(u, p, payload) for u, params in targets for p in params for payload in DEFAULT_PAYLOADS]
+    session = get_session()
+
+    def run(job):
+        url, param, payload = job
+        result = check_url(session, url, payload, test_url=replace_param(url, param, payload))
+        result.update({"target": url, "param": param})
+        return result
+
+    def generate():
+        for url, params in targets:
+            if not params:
+                yield json.dumps({"target": url, "status": "Skipped: no redirect-like parameters"}) + "\n"
+        found = 0
+        for result in iter_completed(run, jobs, concurrency, executor=get_executor()):
+            found += 'Vulnerability' in result['status']
+            yield json.dumps(result) + "\n"
+        yield json.dumps({"done": True, "targets": len(targets), "jobs": len(jobs), "vulnerable": found}) + "\n"
+
+    return Response(generate(), mimetype="text/plain")
@@ -1,6 +1,8 @@
-from flask import Blueprint, request, jsonify, send_from_directory
+from flask import Blueprint, request, jsonify, Response, send_from_directory
 import requests
 import os
+from common.wayback import fetch_wayback_urls, stream_urls
+from common.urlclassify import classify_urls, facet_counts
 
 passive_bp = Blueprint('passive_bp', __name__)
 
@@ -15,16 +17,16 @@ def passive_links():
     domain = data.get("domain")
     if not domain:
         return jsonify({"error": "Domain is required"}), 400
-
-    url = f"https://web.archive.org/cdx/search/cdx?url=*.{domain}/*&output=text&fl=original&collapse=urlkey&limit=8000"
+    category = data.get("category")
+    if data.get("stream"):
+        return Response(stream_urls(domain, {category} if category else None), mimetype="text/plain")
 
     try:
-        headers = {'User-Agent': 'PassiveLinkFinder/1.0'}
-        r = requests.get(url, headers=headers, timeout=(10,120))
-        r.raise_for_status()
-
-        links = [x.strip() for x in r.text.split("\n") if x.strip()]
-        return jsonify({"results": links})
+        links = fetch_wayback_urls(domain)
+        facets = classify_urls(links)
+        if category:
+            links = facets.get(category, [])
+        return jsonify({"results": links, "facets": facet_counts(facets)})
 
     except requests.exceptions.RequestException as e:
         return jsonify({"error": f"Failed to fetch from Wayback: {e}"}), 500
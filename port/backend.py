@@ -1,9 +1,18 @@
-from flask import Blueprint, request, jsonify, send_from_directory
+from flask import Blueprint, request, jsonify, Response, send_from_directory
+from common.ratelimit import HostRateLimiter
+from common.scheduler import iter_completed
 import socket
+import time
+import json
 import os
 
 port_bp = Blueprint('port_bp', __name__)
 
+DEFAULT_CONCURRENCY = 200
+MAX_CONCURRENCY = 1000
+DEFAULT_RATE = 1000  # connection attempts per second per host, 0 = unlimited
+PROGRESS_INTERVAL = 1.0  # seconds between progress records in streaming mode
+
 @port_bp.route("/", methods=["GET"])
 def serve_ui():
     folder_path = os.path.dirname(os.path.abspath(__file__))
@@ -29,6 +38,57 @@ def scan_port(ip, port, timeout=1):
     except Exception as e:
         return {"port": port, "status": "error", "banner": str(e)}
 
+def parse_ports(ports_input):
+    ports = []
+    for part in ports_input.split(","):
+        if "-" in part:
+            start, end = part.split("-")
+            ports.extend(range(int(start), int(end) + 1))
+        else:
+            try:
+                ports.append(int(part))
+            except:
+                pass
+    return sorted(set([p for p in ports if 1 <= p <= 65535]))
+
+def scan_ports(ip, ports, timeout=1, concurrency=DEFAULT_CONCURRENCY, rate=DEFAULT_RATE):
+    """Scan ports on a bounded worker pool, yielding results as they complete."""
+    limiter = HostRateLimiter(rate)
+
+    def task(port):
+        limiter.acquire(ip)
+        return scan_port(ip, port, timeout)
+
+    return iter_completed(task, ports, concurrency)
+
+def stream_scan(target, ip, ports, timeout, concurrency, rate):
+    """NDJSON generator: one record per open port plus periodic progress records."""
+    yield json.dumps({"type": "start", "target": target, "ip": ip, "ports_scanned": len(ports)}) + "\n"
+    start = last_progress = time.time()
+    done = open_count = 0
+    for result in scan_ports(ip, ports, timeout, concurrency, rate):
+        done += 1
+        if result["status"] == "open":
+            open_count += 1
+            yield json.dumps({"type": "open", **result}) + "\n"
+        now = time.time()
+        if now - last_progress >= PROGRESS_INTERVAL:
+            last_progress = now
+            yield json.dumps({
+                "type": "progress",
+                "done": done,
+                "total": len(ports),
+                "ports_per_second": round(done / (now - start), 1)
+            }) + "\n"
+    yield json.dumps({
+        "done": True,
+        "target": target,
+        "ip": ip,
+        "ports_scanned": len(ports),
+        "open_ports": open_count,
+        "elapsed": round(time.time() - start, 2)
+    }) + "\n"
+
 @port_bp.route("/scan", methods=["POST"])
 def port_scan():
     data = request.get_json()
@@ -44,19 +104,14 @@ def port_scan():
     except Exception:
         return jsonify({"error": "Could not resolve target"}), 400
 
-    ports = []
-    for part in ports_input.split(","):
-        if "-" in part:
-            start, end = part.split("-")
-            ports.extend(range(int(start), int(end) + 1))
-        else:
-            try:
-                ports.append(int(part))
-            except:
-                pass
-    ports = sorted(set([p for p in ports if 1 <= p <= 65535]))
+    ports = parse_ports(ports_input)
+    concurrency = min(max(int(data.get("concurrency", DEFAULT_CONCURRENCY)), 1), MAX_CONCURRENCY)
+    rate = float(data.get("rate", DEFAULT_RATE))
+
+    if data.get("stream"):
+        return Response(stream_scan(target, ip, ports, timeout, concurrency, rate), mimetype="text/plain")
 
-    results = [scan_port(ip, port, timeout) for port in ports]
+    results = sorted(scan_ports(ip, ports, timeout, concurrency, rate), key=lambda r: r["port"])
     open_ports = [r for r in results if r["status"] == "open"]
 
     return jsonify({
@@ -1,8 +1,10 @@
-from flask import Blueprint, jsonify, request, send_file
+from flask import Blueprint, jsonify, request, send_file, Response, stream_with_context
 from datetime import datetime
-import json
+from reports import store
+from reports.exporters import EXPORTERS
+import hashlib
 import os
-from io import BytesIO
+import tempfile
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -11,31 +13,39 @@ from reportlab.lib.units import inch
 
 reports_bp = Blueprint('reports', __name__)
 
-# Path to store reports data
-REPORTS_DIR = os.path.join(os.path.dirname(__file__), 'data')
-REPORTS_FILE = os.path.join(REPORTS_DIR, 'reports.json')
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+LIST_FILTERS = ('tool', 'target', 'severity', 'date_from', 'date_to')
 
-# Ensure directory exists
-os.makedirs(REPORTS_DIR, exist_ok=True)
-
-def load_reports():
-    """Load reports from JSON file"""
-    if os.path.exists(REPORTS_FILE):
-        with open(REPORTS_FILE, 'r') as f:
-            return json.load(f)
-    return []
-
-def save_reports(reports):
-    """Save reports to JSON file"""
-    with open(REPORTS_FILE, 'w') as f:
-        json.dump(reports, f, indent=2)
+# Rendered PDFs are cached on disk by report id and content hash
+EXPORT_DIR = os.path.join(store.DATA_DIR, 'exports')
+SCAN_ROWS_PER_TABLE = 40  # about one page; small tables avoid reportlab's costly splitting of one huge table
 
 @reports_bp.route('/', methods=['GET'])
 def get_reports():
-    """Get all generated reports"""
+    """Get generated reports.
+
+    Without query parameters this returns every full report, as before. With
+    limit/cursor/view or any filter it returns one page:
+    {'reports': [...], 'next_cursor': ...}, using the summary projection unless
+    view=full.
+    """
     try:
-        reports = load_reports()
-        return jsonify(reports), 200
+        if not request.args:
+            return jsonify(store.list_reports()), 200
+
+        limit = min(max(request.args.get('limit', DEFAULT_PAGE_SIZE, type=int), 1), MAX_PAGE_SIZE)
+        filters = {k: request.args.get(k) for k in LIST_FILTERS if request.args.get(k)}
+        try:
+            reports, next_cursor = store.query_reports(
+                limit=limit,
+                cursor=request.args.get('cursor'),
+                summary=request.args.get('view', 'summary') != 'full',
+                **filters
+            )
+        except (ValueError, KeyError):
+            return jsonify({'error': 'Invalid cursor'}), 400
+        return jsonify({'reports': reports, 'next_cursor': next_cursor}), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -47,20 +57,14 @@ def generate_report():
         scans = data.get('scans', [])
         report_name = data.get('name', f"Security Scan Report - {datetime.now().strftime('%Y-%m-%d %H:%M')}")
         
-        reports = load_reports()
-        
-        # Create new report
-        new_report = {
-            'id': f"report_{len(reports) + 1}_{int(datetime.now().timestamp())}",
+        # Create new report; the store numbers it when inserting
+        new_report = store.create_report({
             'name': report_name,
             'date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
             'scans': scans,
             'total_scans': len(scans),
             'created_at': datetime.now().isoformat()
-        }
-        
-        reports.insert(0, new_report)
-        save_reports(reports)
+        }, int(datetime.now().timestamp()))
         
         return jsonify({'success': True, 'report': new_report}), 200
     except Exception as e:
@@ -70,97 +74,152 @@ def generate_report():
 def delete_report(report_id):
     """Delete a report"""
     try:
-        reports = load_reports()
-        reports = [r for r in reports if r['id'] != report_id]
-        save_reports(reports)
+        store.delete_report(report_id)
+        remove_cached_exports(report_id)
         return jsonify({'success': True}), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def report_content_hash(report):
+    """Hash of everything the PDF shows, read scan by scan."""
+    digest = hashlib.sha256()
+    digest.update(f"{report['id']}|{report['name']}|{report['date']}|{report['total_scans']}".encode())
+    for scan in store.iter_scans(report['id']):
+        digest.update(f"\n{scan.get('tool', 'N/A')}|{scan.get('date', 'N/A')}".encode())
+    return digest.hexdigest()[:16]
+
+def cached_export_path(report_id, content_hash, ext='pdf'):
+    return os.path.join(EXPORT_DIR, f"{report_id}-{content_hash}.{ext}")
+
+def remove_cached_exports(report_id, keep=None):
+    if not os.path.isdir(EXPORT_DIR):
+        return
+    for name in os.listdir(EXPORT_DIR):
+        path = os.path.join(EXPORT_DIR, name)
+        if name.startswith(f"{report_id}-") and path != keep:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+def scan_tables(scans):
+    """Split the scan history into page-sized tables with their own header row."""
+    style = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#0ea5e9')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ])
+    chunk = []
+    for scan in scans:
+        chunk.append([scan.get('tool', 'N/A'), scan.get('date', 'N/A')])
+        if len(chunk) == SCAN_ROWS_PER_TABLE:
+            yield Table([['Tool', 'Date/Time']] + chunk, colWidths=[3*inch, 3*inch], style=style, repeatRows=1)
+            chunk = []
+    if chunk:
+        yield Table([['Tool', 'Date/Time']] + chunk, colWidths=[3*inch, 3*inch], style=style, repeatRows=1)
+
+def render_pdf(report, fileobj):
+    doc = SimpleDocTemplate(fileobj, pagesize=letter)
+
+    # Container for PDF elements
+    elements = []
+    styles = getSampleStyleSheet()
+
+    # Title
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        textColor=colors.HexColor('#0ea5e9'),
+        spaceAfter=30,
+        alignment=1  # Center
+    )
+    elements.append(Paragraph(report['name'], title_style))
+    elements.append(Spacer(1, 0.3*inch))
+
+    # Report Info
+    info_data = [
+        ['Report Generated:', report['date']],
+        ['Total Scans:', str(report['total_scans'])],
+        ['Report ID:', report['id']]
+    ]
+
+    info_table = Table(info_data, colWidths=[2*inch, 4*inch])
+    info_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#e2e8f0')),
+        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+        ('GRID', (0, 0), (-1, -1), 1, colors.grey)
+    ]))
+    elements.append(info_table)
+    elements.append(Spacer(1, 0.5*inch))
+
+    # Scan History
+    elements.append(Paragraph('Scan History', styles['Heading2']))
+    elements.append(Spacer(1, 0.2*inch))
+
+    tables = list(scan_tables(store.iter_scans(report['id'])))
+    if tables:
+        elements.extend(tables)
+    else:
+        elements.append(Paragraph('No scans recorded in this report.', styles['Normal']))
+
+    doc.build(elements)
+
 @reports_bp.route('/export/<report_id>', methods=['GET'])
 def export_report(report_id):
-    """Export report as PDF"""
+    """Export report as PDF, re-rendering only when the report content changed"""
     try:
-        reports = load_reports()
-        report = next((r for r in reports if r['id'] == report_id), None)
-        
+        report = store.get_report_summary(report_id)
+
         if not report:
             return jsonify({'error': 'Report not found'}), 404
-        
-        # Create PDF in memory
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=letter)
-        
-        # Container for PDF elements
-        elements = []
-        styles = getSampleStyleSheet()
-        
-        # Title
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            textColor=colors.HexColor('#0ea5e9'),
-            spaceAfter=30,
-            alignment=1  # Center
-        )
-        elements.append(Paragraph(report['name'], title_style))
-        elements.append(Spacer(1, 0.3*inch))
-        
-        # Report Info
-        info_data = [
-            ['Report Generated:', report['date']],
-            ['Total Scans:', str(report['total_scans'])],
-            ['Report ID:', report['id']]
-        ]
-        
-        info_table = Table(info_data, colWidths=[2*inch, 4*inch])
-        info_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#e2e8f0')),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-            ('GRID', (0, 0), (-1, -1), 1, colors.grey)
-        ]))
-        elements.append(info_table)
-        elements.append(Spacer(1, 0.5*inch))
-        
-        # Scan History
-        elements.append(Paragraph('Scan History', styles['Heading2']))
-        elements.append(Spacer(1, 0.2*inch))
-        
-        if report['scans']:
-            scan_data = [['Tool', 'Date/Time']]
-            for scan in report['scans']:
-                scan_data.append([scan.get('tool', 'N/A'), scan.get('date', 'N/A')])
-            
-            scan_table = Table(scan_data, colWidths=[3*inch, 3*inch])
-            scan_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#0ea5e9')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 12),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black)
-            ]))
-            elements.append(scan_table)
-        else:
-            elements.append(Paragraph('No scans recorded in this report.', styles['Normal']))
-        
-        # Build PDF
-        doc.build(elements)
-        buffer.seek(0)
-        
+
+        path = cached_export_path(report_id, report_content_hash(report))
+        if not os.path.exists(path):
+            # Render into a temp file next to the cache entry, then publish it atomically
+            os.makedirs(EXPORT_DIR, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=EXPORT_DIR, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    render_pdf(report, f)
+                os.replace(tmp, path)
+            finally:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+            remove_cached_exports(report_id, keep=path)
+
+        # send_file streams the cached file from disk in chunks
         return send_file(
-            buffer,
+            path,
             as_attachment=True,
             download_name=f"{report['name'].replace(' ', '_')}.pdf",
             mimetype='application/pdf'
         )
-        
+
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
\ No newline at end of file
+        return jsonify({'error': str(e)}), 500
+
+@reports_bp.route('/export/<report_id>/<fmt>', methods=['GET'])
+def export_report_as(report_id, fmt):
+    """Stream report findings as JSON Lines, CSV or SARIF, row by row"""
+    if fmt not in EXPORTERS:
+        return jsonify({'error': f"Unknown format. Choose one of: {', '.join(EXPORTERS)}"}), 400
+    report = store.get_report_summary(report_id)
+    if not report:
+        return jsonify({'error': 'Report not found'}), 404
+
+    exporter, mimetype, ext = EXPORTERS[fmt]
+    return Response(
+        stream_with_context(exporter(report)),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename="{report["name"].replace(" ", "_")}.{ext}"'}
+    )
@@ -0,0 +1,70 @@
+import csv
+import io
+import json
+from reports import store
+
+CSV_COLUMNS = ["report_id", "scan", "tool", "date", "target", "severity", "title", "detail"]
+
+SARIF_LEVELS = {"critical": "error", "high": "error", "medium": "warning", "low": "note", "info": "none"}
+
+
+def export_jsonl(report):
+    for row in store.iter_export_rows(report['id']):
+        yield json.dumps(row) + "\n"
+
+
+def export_csv(report):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush():
+        data = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return data
+
+    writer.writerow(CSV_COLUMNS)
+    yield flush()
+    for row in store.iter_export_rows(report['id']):
+        row = dict(row, detail=json.dumps(row['detail']) if row['detail'] is not None else "")
+        writer.writerow([row[c] for c in CSV_COLUMNS])
+        yield flush()
+
+
+def sarif_result(row):
+    result = {
+        "ruleId": row['tool'] or "scan",
+        "level": SARIF_LEVELS.get(row['severity'], "warning"),
+        "message": {"text": row['title'] or f"{row['tool']} scan"},
+        "properties": {"severity": row['severity'], "date": row['date'], "scan": row['scan']},
+    }
+    if row['target']:
+        result["locations"] = [{"physicalLocation": {"artifactLocation": {"uri": row['target']}}}]
+    if row['detail'] is not None:
+        result["properties"]["detail"] = row['detail']
+    return result
+
+
+def export_sarif(report):
+    """SARIF 2.1.0 log written piecewise; results are emitted as they are read."""
+    head = {
+        "version": "2.1.0",
+        "$schema": "https://json.schemastore.org/sarif-2.1.0.json",
+    }
+    run_props = {"reportId": report['id'], "reportName": report['name'], "date": report['date']}
+    yield json.dumps(head)[:-1]
+    yield ', "runs": [{"tool": {"driver": {"name": "LINA Security Scanner"}}, '
+    yield f'"properties": {json.dumps(run_props)}, "results": ['
+    first = True
+    for row in store.iter_export_rows(report['id']):
+        yield ("" if first else ", ") + json.dumps(sarif_result(row))
+        first = False
+    yield "]}]}\n"
+
+
+# format -> (generator, mimetype, file extension)
+EXPORTERS = {
+    "jsonl": (export_jsonl, "application/x-ndjson", "jsonl"),
+    "csv": (export_csv, "text/csv", "csv"),
+    "sarif": (export_sarif, "application/sarif+json", "sarif"),
+}
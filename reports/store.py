@@ -0,0 +1,315 @@
+import base64
+import json
+import os
+import sqlite3
+import threading
+import uuid
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+DB_PATH = os.path.join(DATA_DIR, 'reports.db')
+LEGACY_JSON = os.path.join(DATA_DIR, 'reports.json')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    date TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    total_scans INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_reports_date ON reports(date);
+CREATE INDEX IF NOT EXISTS idx_reports_created_at ON reports(created_at);
+
+CREATE TABLE IF NOT EXISTS scans (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    report_id TEXT NOT NULL REFERENCES reports(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    tool TEXT,
+    date TEXT,
+    target TEXT,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_scans_report ON scans(report_id, position);
+CREATE INDEX IF NOT EXISTS idx_scans_tool ON scans(tool);
+CREATE INDEX IF NOT EXISTS idx_scans_target ON scans(target);
+
+CREATE TABLE IF NOT EXISTS findings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    scan_id INTEGER NOT NULL REFERENCES scans(id) ON DELETE CASCADE,
+    report_id TEXT NOT NULL REFERENCES reports(id) ON DELETE CASCADE,
+    tool TEXT,
+    target TEXT,
+    severity TEXT NOT NULL,
+    title TEXT,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_findings_report ON findings(report_id);
+CREATE INDEX IF NOT EXISTS idx_findings_scan ON findings(scan_id);
+CREATE INDEX IF NOT EXISTS idx_findings_tool ON findings(tool);
+CREATE INDEX IF NOT EXISTS idx_findings_target ON findings(target);
+CREATE INDEX IF NOT EXISTS idx_findings_severity ON findings(severity);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+SUMMARY_COLUMNS = "seq, id, name, date, created_at, total_scans"
+
+POSITIVE_MARKERS = ("vulnerab", "detected", "possible")
+NEGATIVE_MARKERS = ("safe", "not detected")
+
+_local = threading.local()
+_init_lock = threading.Lock()
+_initialized = False
+
+
+def get_conn():
+    """One connection per thread; WAL lets readers run alongside a writer."""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        os.makedirs(DATA_DIR, exist_ok=True)
+        conn = sqlite3.connect(DB_PATH, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        _local.conn = conn
+    _ensure_schema(conn)
+    return conn
+
+
+def _ensure_schema(conn):
+    global _initialized
+    if _initialized:
+        return
+    with _init_lock:
+        if _initialized:
+            return
+        conn.executescript(SCHEMA)
+        _import_legacy_json(conn)
+        _backfill_severity(conn)
+        _initialized = True
+
+
+def _import_legacy_json(conn):
+    """One-time import of reports.json written by earlier versions."""
+    if conn.execute("SELECT 1 FROM meta WHERE key = 'json_imported'").fetchone():
+        return
+    legacy = []
+    if os.path.exists(LEGACY_JSON):
+        with open(LEGACY_JSON, 'r') as f:
+            legacy = json.load(f)
+    with conn:
+        # reports.json is newest-first; insert oldest first so seq order matches
+        for report in reversed(legacy):
+            _insert(conn, report)
+        conn.execute("INSERT INTO meta (key, value) VALUES ('json_imported', '1')")
+
+
+def _backfill_severity(conn):
+    """Re-rate findings stored before error-based detections were recognised as positives."""
+    if conn.execute("SELECT 1 FROM meta WHERE key = 'severity_v2'").fetchone():
+        return
+    with conn:
+        rows = conn.execute("SELECT id, body FROM findings WHERE severity = 'info'").fetchall()
+        conn.executemany(
+            "UPDATE findings SET severity = ? WHERE id = ?",
+            [(severity, row['id']) for row in rows
+             if (severity := severity_of(json.loads(row['body']))) != 'info']
+        )
+        conn.execute("INSERT INTO meta (key, value) VALUES ('severity_v2', '1')")
+
+
+def severity_of(item):
+    if item.get("severity"):
+        return str(item["severity"]).lower()
+    status = str(item.get("status", "")).lower()
+    if item.get("vulnerable") is True:
+        return "high"
+    # "Error: ..." is a failed check, but "Error-based SQLi Detected" is a finding
+    if status.startswith("error:") or status == "error":
+        return "info"
+    if any(m in status for m in POSITIVE_MARKERS) and not any(m in status for m in NEGATIVE_MARKERS):
+        return "high"
+    return "info"
+
+
+def extract_findings(scan):
+    """Individual result rows embedded in a scan, if the scan carries any."""
+    items = scan.get("findings") or scan.get("results") or []
+    findings = []
+    for item in items if isinstance(items, list) else []:
+        if not isinstance(item, dict):
+            continue
+        findings.append({
+            "target": item.get("url") or item.get("target") or scan.get("target"),
+            "severity": severity_of(item),
+            "title": item.get("status") or item.get("payload") or item.get("title"),
+            "body": item,
+        })
+    return findings
+
+
+def _insert(conn, report):
+    conn.execute(
+        "INSERT INTO reports (id, name, date, created_at, total_scans) VALUES (?, ?, ?, ?, ?)",
+        (report['id'], report['name'], report['date'], report['created_at'], report['total_scans'])
+    )
+    _insert_scans(conn, report)
+
+
+def _insert_scans(conn, report):
+    for position, scan in enumerate(report.get('scans', [])):
+        cur = conn.execute(
+            "INSERT INTO scans (report_id, position, tool, date, target, body) VALUES (?, ?, ?, ?, ?, ?)",
+            (report['id'], position, scan.get('tool'), scan.get('date'), scan.get('target'), json.dumps(scan))
+        )
+        conn.executemany(
+            "INSERT INTO findings (scan_id, report_id, tool, target, severity, title, body) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(cur.lastrowid, report['id'], scan.get('tool'), f['target'], f['severity'], f['title'], json.dumps(f['body']))
+             for f in extract_findings(scan)]
+        )
+
+
+def create_report(report, timestamp):
+    """Insert a new report whose id, report_<seq>_<timestamp>, uses the seq the insert assigns.
+
+    The id is set in the same transaction, so concurrent inserts can never collide.
+    Returns the report with its id.
+    """
+    conn = get_conn()
+    with conn:
+        cur = conn.execute(
+            "INSERT INTO reports (id, name, date, created_at, total_scans) VALUES (?, ?, ?, ?, ?)",
+            (uuid.uuid4().hex, report['name'], report['date'], report['created_at'], report['total_scans'])
+        )
+        report = {'id': f"report_{cur.lastrowid}_{timestamp}", **report}
+        conn.execute("UPDATE reports SET id = ? WHERE seq = ?", (report['id'], cur.lastrowid))
+        _insert_scans(conn, report)
+    return report
+
+
+def delete_report(report_id):
+    conn = get_conn()
+    with conn:
+        cur = conn.execute("DELETE FROM reports WHERE id = ?", (report_id,))
+    return cur.rowcount > 0
+
+
+def _row_to_report(conn, row):
+    report = dict(row)
+    report.pop('seq', None)
+    report['scans'] = [json.loads(r['body']) for r in conn.execute(
+        "SELECT body FROM scans WHERE report_id = ? ORDER BY position", (report['id'],)
+    )]
+    return report
+
+
+def get_report_summary(report_id):
+    row = get_conn().execute(f"SELECT {SUMMARY_COLUMNS} FROM reports WHERE id = ?", (report_id,)).fetchone()
+    if not row:
+        return None
+    report = dict(row)
+    report.pop('seq')
+    return report
+
+
+def iter_scans(report_id):
+    """Yield a report's scans in order without materialising the whole list."""
+    cur = get_conn().execute("SELECT body FROM scans WHERE report_id = ? ORDER BY position", (report_id,))
+    for row in cur:
+        yield json.loads(row['body'])
+
+
+def list_reports():
+    conn = get_conn()
+    rows = conn.execute("SELECT * FROM reports ORDER BY seq DESC").fetchall()
+    return [_row_to_report(conn, row) for row in rows]
+
+
+def encode_cursor(seq):
+    return base64.urlsafe_b64encode(json.dumps({"seq": seq}).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """The seq encoded in cursor; ValueError for anything encode_cursor could not have produced."""
+    padded = cursor + "=" * (-len(cursor) % 4)
+    data = json.loads(base64.urlsafe_b64decode(padded))
+    if not isinstance(data, dict) or not isinstance(data.get("seq"), int):
+        raise ValueError("Invalid cursor")
+    return data["seq"]
+
+
+def query_reports(limit=50, cursor=None, tool=None, target=None, severity=None,
+                  date_from=None, date_to=None, summary=True):
+    """One page of reports, newest first, using keyset pagination on seq.
+
+    Returns (reports, next_cursor); next_cursor is None on the last page. The
+    summary projection skips the scans table entirely.
+    """
+    clauses, args = [], []
+    if cursor:
+        clauses.append("r.seq < ?")
+        args.append(decode_cursor(cursor))
+    if tool:
+        clauses.append("EXISTS (SELECT 1 FROM scans s WHERE s.report_id = r.id AND s.tool = ?)")
+        args.append(tool)
+    if target:
+        clauses.append("(EXISTS (SELECT 1 FROM scans s WHERE s.report_id = r.id AND s.target = ?)"
+                       " OR EXISTS (SELECT 1 FROM findings f WHERE f.report_id = r.id AND f.target = ?))")
+        args.extend([target, target])
+    if severity:
+        clauses.append("EXISTS (SELECT 1 FROM findings f WHERE f.report_id = r.id AND f.severity = ?)")
+        args.append(severity.lower())
+    if date_from:
+        clauses.append("r.date >= ?")
+        args.append(date_from)
+    if date_to:
+        clauses.append("r.date <= ?")
+        # A bare YYYY-MM-DD includes the whole day
+        args.append(date_to + " 23:59:59" if len(date_to) == 10 else date_to)
+
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    conn = get_conn()
+    rows = conn.execute(
+        f"SELECT {SUMMARY_COLUMNS} FROM reports r {where} ORDER BY r.seq DESC LIMIT ?",
+        args + [limit + 1]
+    ).fetchall()
+
+    next_cursor = encode_cursor(rows[limit - 1]['seq']) if len(rows) > limit else None
+    rows = rows[:limit]
+    if summary:
+        reports = []
+        for row in rows:
+            report = dict(row)
+            report.pop('seq')
+            reports.append(report)
+    else:
+        reports = [_row_to_report(conn, row) for row in rows]
+    return reports, next_cursor
+
+
+def iter_export_rows(report_id):
+    """Flat export rows: one per finding, or one per scan that carries no findings."""
+    cur = get_conn().execute(
+        """SELECT s.position, s.tool, s.date, s.target AS scan_target,
+                  f.target, f.severity, f.title, f.body
+           FROM scans s LEFT JOIN findings f ON f.scan_id = s.id
+           WHERE s.report_id = ?
+           ORDER BY s.position, f.id""",
+        (report_id,)
+    )
+    for row in cur:
+        yield {
+            "report_id": report_id,
+            "scan": row['position'],
+            "tool": row['tool'],
+            "date": row['date'],
+            "target": row['target'] or row['scan_target'],
+            "severity": row['severity'] or "info",
+            "title": row['title'],
+            "detail": json.loads(row['body']) if row['body'] else None,
+        }
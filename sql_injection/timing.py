@@ -0,0 +1,76 @@
+import math
+import statistics
+import threading
+import time
+from concurrent.futures import Future
+from urllib.parse import urlsplit
+import requests
+
+BASELINE_SAMPLES = 3
+MIN_SLEEP = 1
+MAX_SLEEP = 5
+JITTER_FACTOR = 5  # the injected sleep should stand this many stdevs above normal jitter
+CONFIRM_ROUNDS = 2
+EXTRA_CONFIRM_ROUNDS = 2  # when jitter forces MAX_SLEEP, the sleep alone is not conclusive
+
+
+class TimingProfile:
+    def __init__(self, samples):
+        self.mean = statistics.mean(samples)
+        self.stdev = statistics.pstdev(samples)
+        wanted = math.ceil(JITTER_FACTOR * self.stdev)
+        self.delay = min(MAX_SLEEP, max(MIN_SLEEP, wanted))
+        self.rounds = CONFIRM_ROUNDS + (EXTRA_CONFIRM_ROUNDS if wanted > MAX_SLEEP else 0)
+        self.threshold = self.mean + 0.75 * self.delay
+        self.timeout = max(samples) + self.delay + 2
+
+    def is_delayed(self, elapsed):
+        return elapsed >= self.threshold
+
+
+class TimingEngine:
+    """Adaptive time-based detection for one scan.
+
+    Latency is sampled once per target to pick the smallest sleep that stands
+    out from the observed jitter. A slow first response is only reported after
+    alternating zero/full sleep rounds agree; a fast one stops immediately.
+    """
+
+    def __init__(self, session, limiter=None):
+        self.session = session
+        self.limiter = limiter
+        self._profiles = {}
+        self._lock = threading.Lock()
+
+    def fetch(self, url, timeout):
+        """Uncached GET returning (response, elapsed); a timeout counts as a full-length delay."""
+        if self.limiter:
+            self.limiter.acquire(urlsplit(url).hostname)
+        start = time.time()
+        try:
+            return self.session.get(url, timeout=timeout), time.time() - start
+        except requests.Timeout:
+            return None, time.time() - start
+
+    def profile(self, url):
+        with self._lock:
+            future = self._profiles.get(url)
+            owner = future is None
+            if owner:
+                future = self._profiles[url] = Future()
+        if owner:
+            try:
+                samples = [self.fetch(url, timeout=10)[1] for _ in range(BASELINE_SAMPLES)]
+                future.set_result(TimingProfile(samples))
+            except Exception as e:
+                future.set_exception(e)
+        return future.result()
+
+    def confirm(self, url_for_delay, profile):
+        """Alternate SLEEP(0) and SLEEP(delay) rounds; every round must behave as expected."""
+        for i in range(profile.rounds):
+            delay = 0 if i % 2 == 0 else profile.delay
+            _, elapsed = self.fetch(url_for_delay(delay), profile.timeout)
+            if profile.is_delayed(elapsed) != (delay > 0):
+                return False
+        return True
@@ -1,11 +1,30 @@
 import ssl
 import socket
-from flask import Blueprint, request, jsonify, send_from_directory
+import hashlib
+import json
+from flask import Blueprint, request, jsonify, Response, send_from_directory
 from datetime import datetime
+from common.cache import TTLCache
+from common.scheduler import iter_completed
+from ssl_scanner.enumeration import enumerate_tls
 import os
 
 ssl_bp = Blueprint('ssl_bp', __name__)
 
+DEFAULT_TIMEOUT = 5.0
+DEFAULT_CONCURRENCY = 20
+MAX_CONCURRENCY = 100
+MAX_BATCH_HOSTS = 10000
+CACHE_TTL = int(os.getenv("TLS_CACHE_TTL", 3600))
+CACHE_MAX_ENTRIES = int(os.getenv("TLS_CACHE_MAX_ENTRIES", MAX_BATCH_HOSTS))
+
+# Loading the CA store is the expensive part of create_default_context, so share one context
+_context = ssl.create_default_context()
+
+_host_cache = TTLCache(CACHE_TTL, CACHE_MAX_ENTRIES)  # (server, port) -> result
+_sessions = TTLCache(CACHE_TTL, CACHE_MAX_ENTRIES)    # (server, port) -> ssl.SSLSession for resumption on the next handshake
+_cert_cache = TTLCache(CACHE_TTL, CACHE_MAX_ENTRIES)  # sha256 fingerprint -> parsed certificate fields
+
 @ssl_bp.route("/", methods=["GET"])
 def serve_ui():
     folder = os.path.dirname(os.path.abspath(__file__))
@@ -19,6 +38,77 @@ def flatten_name(entry):
             result[key] = value
     return result
 
+def parse_host(host):
+    host = host.strip()
+    for prefix in ("https://", "http://"):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    host = host.split("/", 1)[0]
+    if ":" in host:
+        server, port = host.rsplit(":", 1)
+        return server, int(port)
+    return host, 443
+
+def parse_certificate(conn):
+    """Certificate fields, parsed once per distinct certificate fingerprint."""
+    fingerprint = hashlib.sha256(conn.getpeercert(binary_form=True)).hexdigest()
+    parsed = _cert_cache.get(fingerprint)
+    if parsed is None:
+        cert = conn.getpeercert()
+        # Parse certificate validity dates
+        not_before = datetime.strptime(cert["notBefore"], "%b %d %H:%M:%S %Y %Z")
+        not_after = datetime.strptime(cert["notAfter"], "%b %d %H:%M:%S %Y %Z")
+        parsed = {
+            "fingerprint": fingerprint,
+            "subject": flatten_name(cert.get("subject", [])),
+            "issuer": flatten_name(cert.get("issuer", [])),
+            "not_before": not_before,
+            "not_after": not_after,
+        }
+        _cert_cache.set(fingerprint, parsed)
+    return parsed
+
+def scan_tls(server, port, timeout=DEFAULT_TIMEOUT):
+    key = (server, port)
+    session = _sessions.get(key)
+
+    with socket.create_connection((server, port), timeout=timeout) as sock:
+        with _context.wrap_socket(sock, server_hostname=server, session=session) as conn:
+            cert = parse_certificate(conn)
+            cipher = conn.cipher() or ()
+            protocol = conn.version() or "Unknown"
+            resumed = conn.session_reused
+            if conn.session is not None:
+                _sessions.set(key, conn.session)
+
+    days_left = (cert["not_after"] - datetime.utcnow()).days
+
+    # Handle cipher tuple safely
+    cipher_name = cipher[0] if len(cipher) > 0 else "Unknown"
+    cipher_protocol = cipher[1] if len(cipher) > 1 else "Unknown"
+    cipher_bits = cipher[2] if len(cipher) > 2 else 0
+
+    result = {
+        "server": server,
+        "port": port,
+        "subject": cert["subject"],
+        "issuer": cert["issuer"],
+        "not_before": cert["not_before"].isoformat(),
+        "not_after": cert["not_after"].isoformat(),
+        "days_left": days_left,
+        "protocol": protocol,
+        "cipher": cipher_name,
+        "cipher_protocol": cipher_protocol,
+        "cipher_strength": cipher_bits,
+        "fingerprint_sha256": cert["fingerprint"],
+        "session_resumed": resumed,
+    }
+    _host_cache.set(key, result)
+    return result
+
+def cached_scan(server, port):
+    return _host_cache.get((server, port))
+
 @ssl_bp.route("/scan", methods=["POST"])
 def tls_test():
     data = request.get_json()
@@ -26,50 +116,67 @@ def tls_test():
     if not host:
         return jsonify({"error": "Host required"}), 400
 
-    if ":" in host:
-        server, port = host.split(":")
-        port = int(port)
-    else:
-        server, port = host, 443
-
     try:
-        ctx = ssl.create_default_context()
-        conn = ctx.wrap_socket(socket.socket(socket.AF_INET), server_hostname=server)
-        conn.settimeout(5.0)
-        conn.connect((server, port))
-
-        cert = conn.getpeercert()
-        cipher = conn.cipher() or ()
-        protocol = conn.version() or "Unknown"
-        conn.close()
+        server, port = parse_host(host)
+        return jsonify(scan_tls(server, port))
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
 
-        # Parse certificate validity dates
-        not_before = datetime.strptime(cert["notBefore"], "%b %d %H:%M:%S %Y %Z")
-        not_after = datetime.strptime(cert["notAfter"], "%b %d %H:%M:%S %Y %Z")
-        days_left = (not_after - datetime.utcnow()).days
-
-        # Handle cipher tuple safely
-        cipher_name = cipher[0] if len(cipher) > 0 else "Unknown"
-        cipher_protocol = cipher[1] if len(cipher) > 1 else "Unknown"
-        cipher_bits = cipher[2] if len(cipher) > 2 else 0
-
-        subject = flatten_name(cert.get("subject", []))
-        issuer = flatten_name(cert.get("issuer", []))
-
-        results = {
-            "server": server,
-            "port": port,
-            "subject": subject,
-            "issuer": issuer,
-            "not_before": not_before.isoformat(),
-            "not_after": not_after.isoformat(),
-            "days_left": days_left,
-            "protocol": protocol,
-            "cipher": cipher_name,
-            "cipher_protocol": cipher_protocol,
-            "cipher_strength": cipher_bits,
-        }
-        return jsonify(results)
+@ssl_bp.route("/enumerate", methods=["POST"])
+def tls_enumerate():
+    """Report every protocol version and cipher suite the host accepts."""
+    data = request.get_json() or {}
+    host = data.get("host", "").strip()
+    if not host:
+        return jsonify({"error": "Host required"}), 400
 
+    concurrency = min(max(int(data.get("concurrency", DEFAULT_CONCURRENCY)), 1), MAX_CONCURRENCY)
+    timeout = float(data.get("timeout", DEFAULT_TIMEOUT))
+    try:
+        server, port = parse_host(host)
+        result = enumerate_tls(server, port, timeout, concurrency)
+        if not any(p["supported"] for p in result["protocols"].values()):
+            reasons = {p.get("reason") for p in result["protocols"].values()}
+            return jsonify({"error": f"No TLS handshake succeeded: {', '.join(sorted(map(str, reasons)))}"}), 502
+        return jsonify(result)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
+
+@ssl_bp.route("/batch", methods=["POST"])
+def tls_batch():
+    """Scan many hosts concurrently and stream one NDJSON record per host."""
+    data = request.get_json() or {}
+    hosts = data.get("hosts") or []
+    if not isinstance(hosts, list) or not hosts:
+        return jsonify({"error": "Provide a non-empty 'hosts' list"}), 400
+    if len(hosts) > MAX_BATCH_HOSTS:
+        return jsonify({"error": f"At most {MAX_BATCH_HOSTS} hosts per batch"}), 400
+
+    # Accept the subdomain finder's [{"subdomain": ...}] output as-is
+    hosts = [h.get("subdomain", "") if isinstance(h, dict) else str(h) for h in hosts]
+    hosts = [h.strip() for h in hosts if h and h.strip()]
+    concurrency = min(max(int(data.get("concurrency", DEFAULT_CONCURRENCY)), 1), MAX_CONCURRENCY)
+    timeout = float(data.get("timeout", DEFAULT_TIMEOUT))
+    use_cache = data.get("use_cache", True)
+
+    def run(host):
+        try:
+            server, port = parse_host(host)
+            cached = cached_scan(server, port) if use_cache else None
+            if cached:
+                return {"host": host, "cached": True, **cached}
+            return {"host": host, "cached": False, **scan_tls(server, port, timeout)}
+        except Exception as e:
+            return {"host": host, "error": str(e)}
+
+    def generate():
+        ok = failed = 0
+        for result in iter_completed(run, hosts, concurrency):
+            if "error" in result:
+                failed += 1
+            else:
+                ok += 1
+            yield json.dumps(result) + "\n"
+        yield json.dumps({"done": True, "hosts": len(hosts), "ok": ok, "failed": failed}) + "\n"
+
+    return Response(generate(), mimetype="text/plain")
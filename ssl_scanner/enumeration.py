@@ -0,0 +1,108 @@
+import socket
+import ssl
+import time
+from common.scheduler import iter_completed
+
+# Versions to probe, oldest first; SSLv3 and older are not available in modern OpenSSL builds
+PROTOCOLS = [
+    ("TLSv1.0", ssl.TLSVersion.TLSv1, ssl.HAS_TLSv1),
+    ("TLSv1.1", ssl.TLSVersion.TLSv1_1, ssl.HAS_TLSv1_1),
+    ("TLSv1.2", ssl.TLSVersion.TLSv1_2, ssl.HAS_TLSv1_2),
+    ("TLSv1.3", ssl.TLSVersion.TLSv1_3, ssl.HAS_TLSv1_3),
+]
+
+# SECLEVEL=0 lets the local OpenSSL offer legacy suites so we can see whether the server accepts them
+ALL_CIPHERS = "ALL:@SECLEVEL=0"
+# PSK and SRP suites need pre-shared credentials, so a handshake can never succeed
+SKIP_AUTH = ("auth-psk", "auth-srp")
+
+DEFAULT_CONCURRENCY = 20
+
+
+def probe_context(version, cipher=None):
+    # Enumeration reports what the server accepts, not whether its certificate is trusted
+    ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    ctx.check_hostname = False
+    ctx.verify_mode = ssl.CERT_NONE
+    ctx.minimum_version = version
+    ctx.maximum_version = version
+    ctx.set_ciphers(f"{cipher}:@SECLEVEL=0" if cipher else ALL_CIPHERS)
+    return ctx
+
+
+def handshake(server, port, ctx, timeout):
+    """Return (negotiated cipher tuple, None) or (None, reason)."""
+    try:
+        with socket.create_connection((server, port), timeout=timeout) as sock:
+            with ctx.wrap_socket(sock, server_hostname=server) as conn:
+                return conn.cipher(), None
+    except ssl.SSLError as e:
+        return None, e.reason or str(e)
+    except OSError as e:
+        return None, str(e)
+
+
+def local_ciphers(protocol_name):
+    """Cipher suites the local OpenSSL can offer for a TLS <= 1.2 version."""
+    ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    ctx.set_ciphers(ALL_CIPHERS)
+    ciphers = []
+    for c in ctx.get_ciphers():
+        if c["protocol"] == "TLSv1.3" or c.get("auth") in SKIP_AUTH:
+            continue
+        # Suites introduced with TLS 1.2 (AEAD, SHA-256 MACs) cannot be used on 1.0/1.1
+        if protocol_name != "TLSv1.2" and c["protocol"] == "TLSv1.2":
+            continue
+        ciphers.append(c)
+    return ciphers
+
+
+def enumerate_tls(server, port, timeout=5.0, concurrency=DEFAULT_CONCURRENCY):
+    """Probe every protocol version, then every cipher of the versions the server accepts.
+
+    Versions are probed first, in parallel; a rejected version is settled by
+    that single handshake and none of its ciphers are tried. TLS 1.3 suites
+    cannot be restricted through Python's ssl module, so for TLS 1.3 only the
+    negotiated suite is reported.
+    """
+    start = time.time()
+    available = [(name, version) for name, version, has in PROTOCOLS if has]
+
+    def probe_version(item):
+        name, version = item
+        cipher, reason = handshake(server, port, probe_context(version), timeout)
+        return name, cipher, reason
+
+    protocols = {}
+    for name, cipher, reason in iter_completed(probe_version, available, concurrency):
+        protocols[name] = {"supported": cipher is not None, "ciphers": []}
+        if cipher is None:
+            protocols[name]["reason"] = reason
+        elif name == "TLSv1.3":
+            protocols[name]["ciphers"] = [{"name": cipher[0], "bits": cipher[2]}]
+    probes = len(available)
+
+    jobs = [(name, version, c) for name, version in available
+            if protocols[name]["supported"] and name != "TLSv1.3"
+            for c in local_ciphers(name)]
+
+    def probe_cipher(job):
+        name, version, c = job
+        cipher, _ = handshake(server, port, probe_context(version, c["name"]), timeout)
+        return name, c, cipher is not None
+
+    for name, c, accepted in iter_completed(probe_cipher, jobs, concurrency):
+        if accepted:
+            protocols[name]["ciphers"].append({"name": c["name"], "bits": c["strength_bits"]})
+    probes += len(jobs)
+
+    for info in protocols.values():
+        info["ciphers"].sort(key=lambda c: (-c["bits"], c["name"]))
+
+    return {
+        "server": server,
+        "port": port,
+        "protocols": {name: protocols[name] for name, _ in available},
+        "probes": probes,
+        "elapsed": round(time.time() - start, 2),
+    }
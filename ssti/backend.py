@@ -1,51 +1,63 @@
 from flask import Blueprint, request, jsonify, send_from_directory
-import requests
+from urllib.parse import quote
+from common.http import get_session, get_executor
+from common.scheduler import iter_completed
+from ssti.fingerprint import Fingerprinter
 import os
 
 ssti_bp = Blueprint('ssti_bp', __name__)
 
-PAYLOADS = [
-    ("{{7*7}}", "49"),
-    ("{{9*9}}", "81"),
-    ("{{1337*1337}}", str(1337*1337)),
-    ("${{7*7}}", "49"),
-    ("<%= 7*7 %>", "49"),
-    ("${7*7}", "49")
-]
+DEFAULT_CONCURRENCY = 7  # one worker per probe family
+MAX_CONCURRENCY = 20
 
 @ssti_bp.route("/", methods=["GET"])
 def serve_ui():
     folder_path = os.path.dirname(os.path.abspath(__file__))
     return send_from_directory(folder_path, "index.html")
 
+def send_probe(session, base_url, payload, expected, family=None):
+    test_url = base_url + quote(payload, safe="")
+    result = {"payload": payload, "expected": expected, "url": test_url}
+    if family:
+        result["family"] = family
+    try:
+        r = session.get(test_url, timeout=10, verify=False)
+        result.update({"status_code": r.status_code, "vulnerable": expected in r.text})
+    except Exception as e:
+        result.update({"status_code": "error", "vulnerable": False, "error": str(e)})
+    return result
+
 @ssti_bp.route("/api", methods=["POST"])
 def ssti_test():
+    """Probe each template syntax concurrently, then fingerprint the engine behind a hit.
+
+    Follow-up probes walk one decision tree, so identifying the engine costs a
+    few extra requests rather than every engine-specific payload.
+    """
     data = request.get_json()
     base_url = data.get("url")
     if not base_url or "?" not in base_url:
         return jsonify({"error": "URL must include ?param= structure"}), 400
 
-    results = []
-    for payload, expected in PAYLOADS:
-        test_url = base_url + payload
-        try:
-            r = requests.get(test_url, timeout=10, verify=False)
-            match = expected in r.text
-            results.append({
-                "payload": payload,
-                "expected": expected,
-                "url": test_url,
-                "status_code": r.status_code,
-                "vulnerable": match
-            })
-        except Exception as e:
-            results.append({
-                "payload": payload,
-                "expected": expected,
-                "url": test_url,
-                "status_code": "error",
-                "vulnerable": False,
-                "error": str(e)
-            })
-
-    return jsonify({"results": results})
+    concurrency = min(max(int(data.get("concurrency", DEFAULT_CONCURRENCY)), 1), MAX_CONCURRENCY)
+    session = get_session()
+    fingerprinter = Fingerprinter()
+    probes = fingerprinter.probes()
+
+    def run(indexed):
+        i, (family, payload, expected) = indexed
+        return i, send_probe(session, base_url, payload, expected, family)
+
+    by_index = dict(iter_completed(run, enumerate(probes), concurrency, executor=get_executor()))
+    results = [by_index[i] for i in range(len(probes))]
+
+    def follow_up(payload, expected):
+        result = send_probe(session, base_url, payload, expected)
+        result["stage"] = "fingerprint"
+        results.append(result)
+        return result["vulnerable"]
+
+    hits = {r["family"] for r in results if r["vulnerable"]}
+    family, engine = fingerprinter.identify(hits, follow_up)
+
+    return jsonify({"results": results, "family": family, "engine": engine})
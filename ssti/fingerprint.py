@@ -0,0 +1,68 @@
+import random
+import string
+
+# One probe per template syntax family, sent concurrently; {a}*{b} is randomised per scan
+PROBES = [
+    ("curly", "{{{{{a}*{b}}}}}"),
+    ("dollar", "${{{a}*{b}}}"),
+    ("erb", "<%= {a}*{b} %>"),
+    ("smarty", "{{{a}*{b}}}"),
+    ("hash", "#{{{a}*{b}}}"),
+    ("velocity", "#set($x={a}*{b})${{x}}"),
+    ("razor", "@({a}*{b})"),
+]
+
+# When several families hit, the first listed wins: Smarty also renders {{..}} as
+# "{product}", and Freemarker also evaluates the legacy #{..} interpolation
+FAMILY_ORDER = ["velocity", "smarty", "curly", "erb", "dollar", "hash", "razor"]
+
+# Follow-up decision trees: (probe, expectation, if rendered, otherwise). A probe
+# renders when the response contains the expectation: "upper" means the token in
+# upper case, "triple" the token three times. Leaves name the engine; None means
+# the family is known but the engine is not.
+TREES = {
+    "curly": ("{{{{3*'{t}'}}}}", "triple",
+              ("{{{{'{t}'|upper}}}}", "upper", "Jinja2", "Tornado"),
+              ("{{{{'{t}'.toUpperCase()}}}}", "upper", "Nunjucks", "Twig")),
+    "smarty": ("{{'{t}'|upper}}", "upper", "Smarty", None),
+    "erb": ("<%= '{t}'.upcase %>", "upper", "ERB",
+            ("<%= '{t}'.toUpperCase() %>", "upper", "EJS", None)),
+    "dollar": ("${{'{t}'?upper_case}}", "upper", "Freemarker",
+               ("${{'{t}'.upper()}}", "upper", "Mako",
+                ("${{'{t}'.toUpperCase()}}", "upper", "Java EL (JSP/Spring/Thymeleaf)", None))),
+    "hash": ("#{{'{t}'.upcase}}", "upper", "Ruby interpolation (Slim/Haml)",
+             ("#{{'{t}'.toUpperCase()}}", "upper", "Pug", None)),
+    "velocity": "Velocity",
+    "razor": "Razor",
+}
+
+
+class Fingerprinter:
+    """Random operands and marker token for one scan, so page content cannot fake a hit."""
+
+    def __init__(self):
+        self.a = random.randint(1000, 9999)
+        self.b = random.randint(1000, 9999)
+        self.token = "".join(random.choices(string.ascii_lowercase, k=8))
+
+    def probes(self):
+        """(family, payload, expected) for the first, concurrent round."""
+        product = str(self.a * self.b)
+        return [(family, template.format(a=self.a, b=self.b), product) for family, template in PROBES]
+
+    def expected(self, kind):
+        return self.token.upper() if kind == "upper" else self.token * 3
+
+    def identify(self, hits, send):
+        """Walk the tree of the winning family; send(payload, expected) returns True when rendered.
+
+        Returns (family, engine); only the follow-ups on the taken path are sent.
+        """
+        family = next((f for f in FAMILY_ORDER if f in hits), None)
+        if family is None:
+            return None, None
+        node = TREES[family]
+        while isinstance(node, tuple):
+            template, kind, rendered, otherwise = node
+            node = rendered if send(template.format(t=self.token), self.expected(kind)) else otherwise
+        return family, node
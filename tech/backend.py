@@ -1,12 +1,22 @@
 from flask import Blueprint, request, jsonify, send_from_directory
-from Wappalyzer import Wappalyzer, WebPage  
+from Wappalyzer import WebPage
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as AnalysisTimeout
+from common.http import get_session
+from tech.engine import get_engine, reload_engine, analyze_page, get_analysis_pool, result_cache, ANALYSIS_TIMEOUT
+import urllib3
 import os
 
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
 tech_bp = Blueprint('tech_bp', __name__)
 
 # Path to the folder where backend.py and index.html live
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
+MAX_BULK_URLS = 1000
+DEFAULT_CONCURRENCY = 20
+MAX_CONCURRENCY = 50
+
 # Serve the HTML UI
 @tech_bp.route("/", methods=["GET"])
 def serve_ui():
@@ -21,10 +31,60 @@ def detect():
     if not url:
         return jsonify({'error': 'No URL provided'}), 400
 
+    cached = result_cache.get(url)
+    if cached is not None:
+        return jsonify(cached)
+
     try:
-        wappalyzer = Wappalyzer.latest()
+        wappalyzer = get_engine()
         webpage = WebPage.new_from_url(url)
         technologies = wappalyzer.analyze_with_categories(webpage)
+        result_cache.set(url, technologies)
         return jsonify(technologies)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
+
+# Reload the fingerprint database without restarting the server
+@tech_bp.route("/reload", methods=["POST"])
+def reload():
+    try:
+        wappalyzer = reload_engine()
+        return jsonify({'success': True, 'technologies': len(wappalyzer.technologies)})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def detect_one(url):
+    cached = result_cache.get(url)
+    if cached is not None:
+        return {"url": url, "technologies": cached, "cached": True}
+    try:
+        response = get_session().get(url, timeout=10, verify=False)
+        # Parsing and pattern matching are CPU-bound, so they run in the process pool
+        technologies = get_analysis_pool().submit(
+            analyze_page, response.url, response.text,
+            {k.lower(): v for k, v in response.headers.items()}  # Wappalyzer looks headers up lower-cased
+        ).result(timeout=ANALYSIS_TIMEOUT)
+        result_cache.set(url, technologies)
+        return {"url": url, "technologies": technologies, "cached": False}
+    except AnalysisTimeout:
+        return {"url": url, "error": f"Analysis timed out after {ANALYSIS_TIMEOUT}s"}
+    except Exception as e:
+        return {"url": url, "error": str(e)}
+
+# POST endpoint for detecting technologies on many URLs at once
+@tech_bp.route("/bulk", methods=["POST"])
+def detect_bulk():
+    data = request.get_json() or {}
+    urls = data.get("urls") or []
+    if not isinstance(urls, list) or not urls:
+        return jsonify({'error': "Provide a non-empty 'urls' list"}), 400
+    if len(urls) > MAX_BULK_URLS:
+        return jsonify({'error': f"At most {MAX_BULK_URLS} URLs per request"}), 400
+
+    # Bare hostnames (e.g. subdomain finder output) are fetched over https
+    urls = [u if u.startswith(("http://", "https://")) else f"https://{u}" for u in (str(u).strip() for u in urls) if u]
+    concurrency = min(max(int(data.get("concurrency", DEFAULT_CONCURRENCY)), 1), MAX_CONCURRENCY)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(detect_one, urls))
+    return jsonify({"results": results})
@@ -0,0 +1,86 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from Wappalyzer import Wappalyzer, WebPage
+from common.cache import TTLCache
+
+# Optional custom technologies.json; the package's bundled database is used otherwise
+TECHNOLOGIES_FILE = os.getenv("WAPPALYZER_TECHNOLOGIES_FILE")
+
+ANALYSIS_PROCESSES = int(os.getenv("TECH_ANALYSIS_PROCESSES", os.cpu_count() or 2))
+CACHE_TTL = int(os.getenv("TECH_CACHE_TTL", 3600))
+CACHE_MAX_ENTRIES = 10000
+ANALYSIS_TIMEOUT = int(os.getenv("TECH_ANALYSIS_TIMEOUT", 60))  # seconds, including a cold worker loading the database
+
+_engine = None
+_technologies_file = TECHNOLOGIES_FILE
+_lock = threading.Lock()
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_engine():
+    """Process-wide Wappalyzer instance, built (and its patterns compiled) on first use."""
+    global _engine
+    if _engine is None:
+        with _lock:
+            if _engine is None:
+                _engine = Wappalyzer.latest(technologies_file=_technologies_file)
+    return _engine
+
+
+def reload_engine(technologies_file=None):
+    """Rebuild the fingerprint database; requests keep using the old one until the swap.
+
+    The analysis pool is retired too, so its workers start over with the new database.
+    """
+    global _engine, _technologies_file, _pool
+    technologies_file = technologies_file or TECHNOLOGIES_FILE
+    engine = Wappalyzer.latest(technologies_file=technologies_file)
+    with _lock:
+        _engine = engine
+        _technologies_file = technologies_file
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+    return engine
+
+
+def warm_up():
+    """Load the database in the background so the first request does not pay for it."""
+    thread = threading.Thread(target=get_engine, name="wappalyzer-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def analyze_page(url, html, headers):
+    """Fingerprint already-fetched page content; picklable so it can run in the process pool."""
+    return get_engine().analyze_with_categories(WebPage(url, html, headers))
+
+
+def _init_worker(technologies_file):
+    """Pool worker initializer: load the database once, without the parent's locks."""
+    global _engine
+    _engine = Wappalyzer.latest(technologies_file=technologies_file)
+
+
+def get_analysis_pool():
+    """Process pool for the CPU-bound HTML parsing and pattern matching of bulk detection.
+
+    Workers are not forked: a fork taken while another thread holds _lock (say
+    during warm_up) would leave the child's copy of the lock held forever.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+                _pool = ProcessPoolExecutor(max_workers=ANALYSIS_PROCESSES, mp_context=context,
+                                            initializer=_init_worker, initargs=(_technologies_file,))
+    return _pool
+
+
+result_cache = TTLCache(CACHE_TTL, CACHE_MAX_ENTRIES)
@@ -1,5 +1,6 @@
 from flask import Blueprint, request, jsonify, send_from_directory
-import requests
+from concurrent.futures import ThreadPoolExecutor
+from common.http import get_session
 import os
 
 xss_bp = Blueprint('xss_bp', __name__)
@@ -7,6 +8,9 @@ xss_bp = Blueprint('xss_bp', __name__)
 # Path to the folder where backend.py and index.html exist
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
+DEFAULT_CONCURRENCY = 10
+MAX_CONCURRENCY = 30
+
 # Serve the HTML UI
 @xss_bp.route("/", methods=["GET"])
 def serve_ui():
@@ -76,17 +80,24 @@ def scan_xss():
     ]
 
 
-    results = []
-    for payload, label in PAYLOADS:
+    concurrency = min(max(int(data.get("concurrency", DEFAULT_CONCURRENCY)), 1), MAX_CONCURRENCY)
+    session = get_session()
+
+    def check_payload(item):
+        payload, label = item
         test_url = target_url + payload
         try:
-            r = requests.get(test_url, timeout=10)
+            r = session.get(test_url, timeout=10)
             body = r.text.lower()
             status = "Safe"
             if payload.lower() in body:
                 status = "Possible Vulnerability" if label == "Possible" else "Confirmed Vulnerability"
-            results.append({"payload": payload, "url": test_url, "status": status})
+            return {"payload": payload, "url": test_url, "status": status}
         except Exception as e:
-            results.append({"payload": payload, "url": test_url, "status": "Error", "error": str(e)})
+            return {"payload": payload, "url": test_url, "status": "Error", "error": str(e)}
+
+    # executor.map keeps results in PAYLOADS order
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(check_payload, PAYLOADS))
 
     return jsonify({"results": results})